@@ -0,0 +1,46 @@
+# benchmarks/compare.py
+"""
+Compares two benchmark reports stage by stage:
+
+    python -m benchmarks.compare baseline.json candidate.json --threshold 1.2
+
+Exits non-zero when any stage got slower than the threshold ratio.
+"""
+import argparse
+import json
+import sys
+
+
+def load_results(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        report = json.load(f)
+    return report, {(r["n_resumes"], r["stage"]): r for r in report["results"]}
+
+
+def main(argv=None):
+    cli = argparse.ArgumentParser(description="Compare two benchmark reports.")
+    cli.add_argument("baseline")
+    cli.add_argument("candidate")
+    cli.add_argument("--threshold", type=float, default=1.2,
+                     help="Flag stages whose min wall time grew by more than this ratio")
+    args = cli.parse_args(argv)
+
+    base_report, base = load_results(args.baseline)
+    cand_report, cand = load_results(args.candidate)
+    print(f"baseline {base_report.get('git_commit')}  vs  candidate {cand_report.get('git_commit')}")
+    print(f"{'n':>8} {'stage':<22} {'baseline':>11} {'candidate':>11} {'ratio':>7}")
+
+    regressions = 0
+    for key in sorted(base.keys() & cand.keys()):
+        old, new = base[key]["wall_s_min"], cand[key]["wall_s_min"]
+        ratio = new / old if old else float("inf")
+        flag = ""
+        if ratio > args.threshold:
+            flag = "  << slower"
+            regressions += 1
+        print(f"{key[0]:>8} {key[1]:<22} {old:>10.4f}s {new:>10.4f}s {ratio:>6.2f}x{flag}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
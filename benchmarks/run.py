@@ -0,0 +1,165 @@
+# benchmarks/run.py
+"""
+Stage-level micro-benchmarks on synthetic data. Each hot-path stage is timed
+in isolation at every requested corpus size and written to a JSON report:
+
+    python -m benchmarks.run --sizes 10 1000 100000 --output bench.json
+    python -m benchmarks.compare old.json new.json
+"""
+import argparse
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+from benchmarks.synthetic import SyntheticCorpus, text_to_pdf
+from core.config import get_config, save_config
+from core.engine import MatchingEngine, make_vectorizer
+from core.parser import ResumeParser
+from core.skills import get_skill_matcher
+from core.tokens import MatrixBuilder, as_docs
+from utils.contact_utils import extract_contact_info
+from utils.text_utils import clean_sections, get_normalizer
+
+REPORT_SCHEMA = 1
+
+# Used for section_scoring when the config weights no section (the shipped default)
+BENCH_SECTION_WEIGHTS = {"full_text": 0.4, "experience": 0.3, "skills": 0.2, "projects": 0.1}
+
+
+def time_stage(fn, repeat):
+    """Runs fn repeat times; returns wall/CPU seconds per run."""
+    wall, cpu = [], []
+    for _ in range(repeat):
+        w0, c0 = time.perf_counter(), time.process_time()
+        fn()
+        wall.append(time.perf_counter() - w0)
+        cpu.append(time.process_time() - c0)
+    return wall, cpu
+
+
+def section_config(config_path, directory):
+    """
+    Path of a config that weights resume sections: config_path itself if it
+    already does, else a copy with BENCH_SECTION_WEIGHTS written into directory.
+    """
+    config = get_config(config_path)
+    if any(w > 0 for s, w in config.section_weights.items() if s != "full_text"):
+        return config_path
+    data = config.as_dict()
+    data["section_weights"] = dict(BENCH_SECTION_WEIGHTS)
+    path = os.path.join(directory, "config.yaml")
+    save_config(data, path)
+    return path
+
+
+def benchmark_size(n, corpus, repeat, pdf_sample, config_path, section_config_path=None):
+    """
+    Times every stage for a corpus of n resumes. Returns one result dict per stage.
+    section_scoring runs on section_config_path (default: config_path).
+    """
+    texts = corpus.resumes(n)
+    normalizer = get_normalizer(config_path)
+    jd = normalizer.clean(corpus.jd(0))
+    cleaned = normalizer.clean_many(texts)
+    # PDF extraction is orders of magnitude slower than the rest; time a sample
+    pdfs = [text_to_pdf(t) for t in texts[:pdf_sample]]
+
+    parser = ResumeParser()
+    matcher = get_skill_matcher(config_path)
+    engine = MatchingEngine(config_path=config_path)
+    section_engine = MatchingEngine(config_path=section_config_path or config_path)
+    fitted = make_vectorizer().fit(cleaned)
+    sections = []
+    for text in texts:
+        segments = {"full_text": text, "offsets": parser.segment_offsets(text)}
+        sections.append(clean_sections(segments, section_engine.section_names, normalizer))
+
+    stages = [
+        ("parse", len(pdfs), lambda: [parser.parse(io.BytesIO(p)) for p in pdfs]),
+        ("clean_text", n, lambda: normalizer.clean_many(texts)),
+        ("contact_extraction", n, lambda: [extract_contact_info(t) for t in texts]),
+        ("tokenize", n, lambda: as_docs(cleaned)),
+        ("skill_extraction", n, lambda: [matcher.find(t) for t in cleaned]),
+        ("matrix_build", n, lambda: MatrixBuilder(tokens=True).add_many(cleaned).tfidf()),
+        ("vectorizer_fit", n, lambda: make_vectorizer().fit(cleaned)),
+        ("vectorizer_transform", n, lambda: fitted.transform(cleaned)),
+        ("scoring", n, lambda: engine.run_tfidf_match(jd, cleaned)),
+        ("section_scoring", n, lambda: section_engine.run_section_match(jd, cleaned, sections)),
+    ]
+
+    results = []
+    for stage, items, fn in stages:
+        wall, cpu = time_stage(fn, repeat)
+        best = min(wall)
+        result = {
+            "n_resumes": n,
+            "stage": stage,
+            "items": items,
+            "repeat": repeat,
+            "wall_s_min": round(best, 6),
+            "wall_s_median": round(statistics.median(wall), 6),
+            "cpu_s_median": round(statistics.median(cpu), 6),
+            "per_item_ms": round(best * 1000 / items, 6) if items else None,
+        }
+        results.append(result)
+        print(f"{n:>8} {stage:<22} {best:>10.4f}s {result['per_item_ms'] or 0:>10.4f} ms/item",
+              file=sys.stderr, flush=True)
+    return results
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv=None):
+    cli = argparse.ArgumentParser(description="Time each matching stage on synthetic resumes.")
+    cli.add_argument("--sizes", type=int, nargs="+", default=[10, 1000], help="Corpus sizes to benchmark")
+    cli.add_argument("--repeat", type=int, default=3, help="Runs per stage; min and median are reported")
+    cli.add_argument("--pdf-sample", type=int, default=200, help="At most this many PDFs per size for the parse stage")
+    cli.add_argument("--seed", type=int, default=0)
+    cli.add_argument("--config", default="data/config.yaml")
+    cli.add_argument("--output", default=None, help="Report path (default: benchmarks/results/<time>-<commit>.json)")
+    args = cli.parse_args(argv)
+
+    commit = _git_commit()
+    corpus = SyntheticCorpus(args.seed, config_path=args.config)
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        section_config_path = section_config(args.config, tmp)
+        for n in args.sizes:
+            results.extend(benchmark_size(n, corpus, args.repeat, args.pdf_sample, args.config, section_config_path))
+
+    report = {
+        "schema": REPORT_SCHEMA,
+        "created_at": datetime.now().isoformat(),
+        "git_commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "params": {"sizes": args.sizes, "repeat": args.repeat, "pdf_sample": args.pdf_sample, "seed": args.seed},
+        "results": results,
+    }
+    output = args.output or os.path.join(
+        "benchmarks", "results", f"{datetime.now():%Y%m%d-%H%M%S}-{commit or 'nogit'}.json"
+    )
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"Report written to {output}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,163 @@
+# benchmarks/synthetic.py
+"""
+Deterministic synthetic resumes and job descriptions, as plain text or as
+minimal single-font PDFs that pypdf can read back. Same seed, same corpus.
+
+    python -m benchmarks.synthetic --count 1000 --out data/synthetic --pdf
+"""
+import argparse
+import os
+import random
+
+from core.config import get_config
+from core.skills import TECH_SKILLS_DB
+
+FIRST_NAMES = ["james", "mary", "john", "linda", "ahmed", "sara", "wei", "priya", "carlos", "olga",
+               "umer", "fatima", "kenji", "emily", "david", "sophia", "michael", "aisha", "lucas", "nina"]
+LAST_NAMES = ["smith", "khan", "garcia", "chen", "patel", "mueller", "rossi", "turner", "lee", "johnson",
+              "williams", "mehboob", "tanaka", "silva", "novak", "brown", "ali", "kim", "lopez", "ivanova"]
+ROLES = ["software engineer", "backend developer", "frontend developer", "data scientist",
+         "devops engineer", "machine learning engineer", "full stack developer", "data analyst"]
+COMPANIES = ["acme corp", "globex", "initech", "umbrella labs", "hooli", "stark industries",
+             "wayne enterprises", "cyberdyne", "tyrell systems", "soylent analytics"]
+SCHOOLS = ["state university", "institute of technology", "national university", "city college"]
+DEGREES = ["bachelor of science in computer science", "master of science in data science",
+           "bachelor of engineering in software engineering", "master of computer applications"]
+VERBS = ["built", "designed", "led", "optimized", "migrated", "maintained", "automated", "deployed",
+         "refactored", "scaled", "mentored", "delivered", "integrated", "monitored"]
+OBJECTS = ["microservices", "data pipelines", "rest apis", "dashboards", "ci pipelines", "etl jobs",
+           "recommendation models", "payment systems", "search features", "internal tools",
+           "reporting services", "mobile backends", "cloud infrastructure", "test suites"]
+OUTCOMES = ["reducing latency by half", "serving millions of requests", "cutting costs significantly",
+            "improving reliability", "for a team of ten engineers", "across three regions",
+            "with strong test coverage", "ahead of schedule", "used by thousands of customers"]
+FILLER = ["strong", "experience", "team", "communication", "problem", "solving", "agile", "scalable",
+          "collaborative", "ownership", "stakeholders", "requirements", "quality", "performance",
+          "production", "design", "architecture", "clean", "code", "reviews", "mentoring"]
+
+
+def skill_pool(config_path="data/config.yaml"):
+    """Taxonomy skills from the config, falling back to the built-in list."""
+    try:
+        skills = [s for group in get_config(config_path).taxonomy.values() for s in group]
+    except OSError:
+        skills = []
+    return sorted(set(skills) or TECH_SKILLS_DB)
+
+
+class SyntheticCorpus:
+    """Generates resume and JD texts with the shape the parser expects (headers, contact line, sections)."""
+
+    def __init__(self, seed=0, skills=None, config_path="data/config.yaml"):
+        self.seed = seed
+        # Same taxonomy as the matcher under test, so generated skills are ones it finds
+        self.skills = skills or skill_pool(config_path)
+
+    def resume(self, i):
+        rng = random.Random(f"{self.seed}-resume-{i}")
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        skills = rng.sample(self.skills, k=min(len(self.skills), rng.randint(4, 12)))
+        lines = [
+            f"{first.title()} {last.title()}",
+            f"{first}.{last}{i}@example.com | +1 ({rng.randint(200, 999)}) {rng.randint(200, 999)}-{rng.randint(1000, 9999)}",
+            "",
+            "Summary",
+            f"{rng.choice(ROLES).title()} with {rng.randint(1, 15)} years of {' '.join(rng.sample(FILLER, 6))}.",
+            "",
+            "Work Experience",
+        ]
+        for _ in range(rng.randint(2, 4)):
+            lines.append(f"{rng.choice(ROLES).title()} - {rng.choice(COMPANIES).title()} ({rng.randint(2008, 2024)})")
+            for _ in range(rng.randint(2, 5)):
+                lines.append(
+                    f"- {rng.choice(VERBS).title()} {rng.choice(OBJECTS)} using {rng.choice(skills)} "
+                    f"and {rng.choice(skills)}, {rng.choice(OUTCOMES)}."
+                )
+        lines += ["", "Education", f"{rng.choice(DEGREES).title()}, {rng.choice(SCHOOLS).title()}", "",
+                  "Technical Skills", ", ".join(skills), "", "Projects"]
+        for _ in range(rng.randint(1, 3)):
+            lines.append(f"- {rng.choice(OBJECTS).title()} with {rng.choice(skills)}: {' '.join(rng.sample(FILLER, 5))}.")
+        return "\n".join(lines)
+
+    def jd(self, i):
+        rng = random.Random(f"{self.seed}-jd-{i}")
+        skills = rng.sample(self.skills, k=min(len(self.skills), rng.randint(4, 8)))
+        role = rng.choice(ROLES)
+        return "\n".join([
+            f"We are hiring a {role} at {rng.choice(COMPANIES).title()}.",
+            f"Requirements: {', '.join(skills)}.",
+            f"You have {rng.randint(2, 8)}+ years of experience and {' '.join(rng.sample(FILLER, 8))}.",
+            f"The team recently {rng.choice(VERBS)} {rng.choice(OBJECTS)} and {rng.choice(VERBS)} {rng.choice(OBJECTS)}.",
+        ])
+
+    def resumes(self, n):
+        return [self.resume(i) for i in range(n)]
+
+    def jds(self, n):
+        return [self.jd(i) for i in range(n)]
+
+
+def text_to_pdf(text, lines_per_page=60):
+    """Minimal PDF 1.4 (Helvetica, one text object per page) holding the given lines."""
+    lines = text.split("\n")
+    pages = [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)] or [[]]
+
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", None,
+               b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>"]
+    page_ids = []
+    for page_lines in pages:
+        body = "".join(f"({_escape(line)}) Tj T*\n" for line in page_lines)
+        stream = f"BT /F1 10 Tf 12 TL 50 800 Td\n{body}ET".encode('latin-1', 'replace')
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 842] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % len(objects)
+        )
+        page_ids.append(len(objects))
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+        b" ".join(b"%d 0 R" % p for p in page_ids), len(page_ids))
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, obj in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (number, obj)
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return bytes(out)
+
+
+def _escape(line):
+    return line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def write_corpus(directory, count, pdf=False, jds=1, seed=0, config_path="data/config.yaml"):
+    """Writes count resumes (.pdf or .txt) plus jds job descriptions into directory."""
+    corpus = SyntheticCorpus(seed, config_path=config_path)
+    resumes_dir = os.path.join(directory, "resumes")
+    os.makedirs(resumes_dir, exist_ok=True)
+    for i in range(count):
+        text = corpus.resume(i)
+        if pdf:
+            with open(os.path.join(resumes_dir, f"resume_{i:06d}.pdf"), 'wb') as f:
+                f.write(text_to_pdf(text))
+        else:
+            with open(os.path.join(resumes_dir, f"resume_{i:06d}.txt"), 'w', encoding='utf-8') as f:
+                f.write(text)
+    for j in range(jds):
+        with open(os.path.join(directory, f"jd_{j:03d}.txt"), 'w', encoding='utf-8') as f:
+            f.write(corpus.jd(j))
+
+
+if __name__ == "__main__":
+    cli = argparse.ArgumentParser(description="Write a synthetic resume corpus.")
+    cli.add_argument("--count", type=int, default=100)
+    cli.add_argument("--jds", type=int, default=1)
+    cli.add_argument("--out", default="data/synthetic")
+    cli.add_argument("--pdf", action="store_true", help="Write PDFs instead of .txt files")
+    cli.add_argument("--seed", type=int, default=0)
+    cli.add_argument("--config", default="data/config.yaml", help="Config whose taxonomy supplies the skills")
+    args = cli.parse_args()
+    write_corpus(args.out, args.count, pdf=args.pdf, jds=args.jds, seed=args.seed, config_path=args.config)
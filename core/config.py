@@ -0,0 +1,136 @@
+# core/config.py
+import copy
+import os
+import threading
+from dataclasses import dataclass
+from types import MappingProxyType
+
+import yaml
+
+from core.skills import SkillMatcher, TECH_SKILLS_DB, tokenize
+from utils.contact_utils import DEFAULT_WINDOW
+from utils.text_utils import DEFAULT_PROTECTED, TextNormalizer
+
+DEFAULT_CONFIG_PATH = "data/config.yaml"
+
+
+@dataclass(frozen=True)
+class AppConfig:
+    """Parsed and compiled configuration. Never mutated; a reload builds a new one."""
+    path: str
+    version: int
+    stamp: tuple
+    raw: MappingProxyType
+    cosine_weight: float
+    jaccard_weight: float
+    scaling: float
+    # Section-weighted cosine: {section or "full_text": weight}; empty scores full text only
+    section_weights: MappingProxyType
+    # Fixed factor per section putting its cosine on the full-text scale (default 1.0)
+    section_scales: MappingProxyType
+    taxonomy: MappingProxyType
+    skill_matcher: SkillMatcher
+    normalizer: TextNormalizer
+    # Ingestion memory bounds: files parsed per chunk, upload bytes a job
+    # holds in memory before spooling the rest to disk, resumes vectorized per chunk
+    ingest_chunk_size: int
+    spool_threshold: int
+    vectorize_chunk_size: int
+    # Leading characters of a resume searched for contact details (0: all)
+    contact_window: int
+
+    def as_dict(self):
+        """Mutable deep copy of the YAML contents, e.g. for the admin editor."""
+        return copy.deepcopy(dict(self.raw))
+
+
+_configs = {}
+_lock = threading.Lock()
+
+
+def _stamp(path):
+    """Cheap change detector: no YAML I/O, just a stat call."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _compile(path, raw, stamp):
+    raw = raw or {}
+    weights = raw.get('scoring_weights') or {}
+    settings = raw.get('settings') or {}
+    ingestion = raw.get('ingestion') or {}
+    taxonomy = {category: tuple(skills) for category, skills in (raw.get('taxonomy') or {}).items()}
+    return AppConfig(
+        path=path,
+        version=int(raw.get('config_version', 0)),
+        stamp=stamp,
+        raw=MappingProxyType(copy.deepcopy(raw)),
+        cosine_weight=float(weights.get('cosine', 0.6)),
+        jaccard_weight=float(weights.get('jaccard', 0.4)),
+        scaling=float(weights.get('scaling_factor', settings.get('scaling_factor', 400))),
+        section_weights=MappingProxyType(
+            {section: float(w) for section, w in (raw.get('section_weights') or {}).items()}
+        ),
+        section_scales=MappingProxyType(
+            {section: float(f) for section, f in (raw.get('section_scales') or {}).items()}
+        ),
+        taxonomy=MappingProxyType(taxonomy),
+        skill_matcher=SkillMatcher(taxonomy or TECH_SKILLS_DB),
+        normalizer=_normalizer(taxonomy or TECH_SKILLS_DB),
+        ingest_chunk_size=int(ingestion.get('chunk_size', 64)),
+        spool_threshold=int(float(ingestion.get('spool_threshold_mb', 32)) * 1024 * 1024),
+        vectorize_chunk_size=int(ingestion.get('vectorize_chunk_size', 2000)),
+        contact_window=int(ingestion.get('contact_window_chars', DEFAULT_WINDOW)),
+    )
+
+
+def _normalizer(taxonomy):
+    """Cleaner that keeps every taxonomy token the a-z filter would break (c++, node.js, ...)."""
+    skills = [s for skills in taxonomy.values() for s in skills] if isinstance(taxonomy, dict) else taxonomy
+    return TextNormalizer(
+        set(DEFAULT_PROTECTED) | {token for skill in skills for token in tokenize(skill) if not token.isalpha()}
+    )
+
+
+def get_config(path=DEFAULT_CONFIG_PATH):
+    """
+    Process-wide compiled config. The YAML is parsed once and only re-read
+    when the file's mtime/size changes (e.g. after an admin save).
+    """
+    stamp = _stamp(path)
+    cached = _configs.get(path)
+    if cached is not None and cached.stamp == stamp:
+        return cached
+
+    with _lock:
+        cached = _configs.get(path)
+        if cached is not None and cached.stamp == stamp:
+            return cached
+        with open(path, 'r') as f:
+            raw = yaml.safe_load(f)
+        config = _compile(path, raw, stamp)
+        _configs[path] = config
+        return config
+
+
+def save_config(config_dict, path=DEFAULT_CONFIG_PATH):
+    """
+    Writes a new config with a bumped config_version. The file is replaced
+    atomically, so readers see either the old or the new version, never a mix.
+    """
+    with _lock:
+        current = _configs.get(path)
+        data = dict(config_dict)
+        data['config_version'] = max(int(data.get('config_version', 0)), current.version if current else 0) + 1
+
+        tmp_path = f"{path}.tmp.{os.getpid()}.{threading.get_ident()}"
+        with open(tmp_path, 'w') as f:
+            yaml.dump(data, f, default_flow_style=False, sort_keys=False)
+        os.replace(tmp_path, path)
+
+        config = _compile(path, data, _stamp(path))
+        _configs[path] = config
+        return config
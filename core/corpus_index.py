@@ -0,0 +1,193 @@
+# core/corpus_index.py
+import json
+import os
+import shutil
+from bisect import bisect_left
+from datetime import datetime
+
+import numpy as np
+from scipy.sparse import csr_matrix
+
+FORMAT_NAME = "resume-tfidf-csr"
+FORMAT_VERSION = 2
+
+# Array files making up one index directory; all opened with np.load(mmap_mode='r')
+_ARRAYS = (
+    "tfidf_data", "tfidf_indices", "tfidf_indptr", "idf",
+    "presence_data", "presence_indices", "presence_indptr"
+)
+
+# String tables (terms, tokens, doc ids) stored as a UTF-8 blob + offsets
+_STRING_TABLES = ("terms", "tokens", "doc_ids")
+
+# Each write goes to its own version subdirectory; this file names the live one
+_POINTER = "CURRENT"
+_VERSION_PREFIX = "v-"
+
+
+class StringTable:
+    """
+    Read-only sequence of strings over a memory-mapped UTF-8 blob and offsets
+    array. Nothing is decoded up front, so opening is O(1) however large the
+    vocabulary; sorted tables support lookup by binary search.
+    """
+
+    def __init__(self, blob, offsets):
+        self._blob = blob
+        self._offsets = offsets
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+    def __getitem__(self, i):
+        return bytes(self._blob[self._offsets[i]:self._offsets[i + 1]]).decode('utf-8')
+
+    def index_of(self, value):
+        """Position of value in a sorted table, or None."""
+        pos = bisect_left(self, value)
+        if pos < len(self) and self[pos] == value:
+            return pos
+        return None
+
+    @staticmethod
+    def save(path_prefix, values):
+        encoded = [str(v).encode('utf-8') for v in values]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(e) for e in encoded], out=offsets[1:])
+        np.save(f"{path_prefix}_blob.npy", np.frombuffer(b"".join(encoded), dtype=np.uint8))
+        np.save(f"{path_prefix}_offsets.npy", offsets)
+
+    @classmethod
+    def open(cls, path_prefix):
+        return cls(
+            np.load(f"{path_prefix}_blob.npy", mmap_mode='r'),
+            np.load(f"{path_prefix}_offsets.npy", mmap_mode='r')
+        )
+
+
+class CorpusIndex:
+    """
+    On-disk resume corpus: the L2-normalised TF-IDF matrix and a binary
+    token-presence matrix (for Jaccard) as raw CSR arrays, plus sorted
+    vocabularies, IDF weights and doc ids. Everything is memory-mapped, so
+    opening is O(1) and every worker process shares one page-cache copy.
+    """
+
+    def __init__(self, tfidf, idf, terms, presence, tokens, doc_ids, manifest):
+        self.tfidf = tfidf
+        self.idf = idf
+        self.terms = terms
+        self.presence = presence
+        self.tokens = tokens
+        self.doc_ids = doc_ids
+        self.manifest = manifest
+
+    def __len__(self):
+        return len(self.doc_ids)
+
+    def term_columns(self, terms):
+        """{term: column} for the given terms that are in the TF-IDF vocabulary."""
+        return _lookup(self.terms, terms)
+
+    def token_columns(self, tokens):
+        """{token: column} for the given tokens that are in the presence vocabulary."""
+        return _lookup(self.tokens, tokens)
+
+    @classmethod
+    def open(cls, directory="data/corpus_index"):
+        with open(os.path.join(directory, _POINTER), 'r', encoding='utf-8') as f:
+            directory = os.path.join(directory, f.read().strip())
+        with open(os.path.join(directory, "manifest.json"), 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        if manifest.get("format") != FORMAT_NAME or manifest.get("version") != FORMAT_VERSION:
+            raise ValueError(
+                f"Unsupported corpus index format {manifest.get('format')} v{manifest.get('version')}; "
+                f"expected {FORMAT_NAME} v{FORMAT_VERSION}. Rebuild the index."
+            )
+        arrays = {name: np.load(os.path.join(directory, f"{name}.npy"), mmap_mode='r') for name in _ARRAYS}
+        tables = {name: StringTable.open(os.path.join(directory, name)) for name in _STRING_TABLES}
+
+        n_docs = manifest["n_docs"]
+        tfidf = csr_matrix(
+            (arrays["tfidf_data"], arrays["tfidf_indices"], arrays["tfidf_indptr"]),
+            shape=(n_docs, len(tables["terms"])), copy=False
+        )
+        presence = csr_matrix(
+            (arrays["presence_data"], arrays["presence_indices"], arrays["presence_indptr"]),
+            shape=(n_docs, len(tables["tokens"])), copy=False
+        )
+        return cls(tfidf, arrays["idf"], tables["terms"], presence, tables["tokens"], tables["doc_ids"], manifest)
+
+    @staticmethod
+    def write(directory, tfidf, idf, terms, presence, tokens, doc_ids, params=None):
+        """
+        Writes a new index version. `terms` and `tokens` must be sorted, as
+        the vectorizers' feature names are. Files go to a fresh version
+        subdirectory and the CURRENT pointer is then replaced atomically, so
+        readers never see a half-written or missing index; processes that
+        still map an older version keep reading it until they reopen.
+        """
+        version = f"{_VERSION_PREFIX}{datetime.now():%Y%m%d%H%M%S%f}-{os.getpid()}"
+        version_dir = os.path.join(directory, version)
+        os.makedirs(version_dir)
+
+        tfidf = tfidf.tocsr()
+        presence = presence.tocsr()
+        # scipy wants indices and indptr in one dtype; matching it here means
+        # opening never has to convert (and so copy) the mapped arrays
+        big = max(tfidf.nnz, presence.nnz, len(terms), len(tokens)) >= 2 ** 31
+        index_dtype = np.int64 if big else np.int32
+        arrays = {
+            "tfidf_data": tfidf.data.astype(np.float32),
+            "tfidf_indices": tfidf.indices.astype(index_dtype),
+            "tfidf_indptr": tfidf.indptr.astype(index_dtype),
+            "idf": np.asarray(idf, dtype=np.float32),
+            # All ones, but stored so the mapped matrix needs no per-process buffer
+            "presence_data": np.ones(presence.nnz, dtype=np.float32),
+            "presence_indices": presence.indices.astype(index_dtype),
+            "presence_indptr": presence.indptr.astype(index_dtype),
+        }
+        for name, array in arrays.items():
+            np.save(os.path.join(version_dir, f"{name}.npy"), array)
+        for name, values in (("terms", terms), ("tokens", tokens), ("doc_ids", doc_ids)):
+            StringTable.save(os.path.join(version_dir, name), values)
+        with open(os.path.join(version_dir, "manifest.json"), 'w', encoding='utf-8') as f:
+            json.dump({
+                "format": FORMAT_NAME,
+                "version": FORMAT_VERSION,
+                "n_docs": tfidf.shape[0],
+                "nnz": int(tfidf.nnz),
+                "params": params or {},
+                "created_at": datetime.now().isoformat(),
+            }, f)
+
+        pointer_tmp = os.path.join(directory, f"{_POINTER}.tmp.{os.getpid()}")
+        with open(pointer_tmp, 'w', encoding='utf-8') as f:
+            f.write(version)
+        previous = _current_version(directory)
+        os.replace(pointer_tmp, os.path.join(directory, _POINTER))
+
+        # A reader may have just read the old pointer, so the previous version
+        # stays until the next write; older complete ones go now (a version
+        # without its manifest is still being written by someone else)
+        for name in os.listdir(directory):
+            if (name.startswith(_VERSION_PREFIX) and name not in (version, previous)
+                    and os.path.exists(os.path.join(directory, name, "manifest.json"))):
+                shutil.rmtree(os.path.join(directory, name), ignore_errors=True)
+
+
+def _current_version(directory):
+    try:
+        with open(os.path.join(directory, _POINTER), 'r', encoding='utf-8') as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+def _lookup(table, values):
+    found = {}
+    for value in set(values):
+        col = table.index_of(value)
+        if col is not None:
+            found[value] = col
+    return found
@@ -1,61 +1,405 @@
 # core/engine.py
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+from collections import Counter
+from scipy.sparse import csr_matrix
+from sklearn.feature_extraction.text import TfidfVectorizer, CountVectorizer
+from sklearn.preprocessing import normalize
 import numpy as np
-import yaml
+from core.config import get_config
+from core.corpus_index import CorpusIndex
+from core.idf_model import IDFModel
+from core.timing import timed
+from core.tokens import MatrixBuilder, as_doc, as_docs
+
+
+def make_vectorizer(**kwargs):
+    """The TF-IDF settings every scoring path shares."""
+    return TfidfVectorizer(stop_words='english', ngram_range=(1, 2), **kwargs)
+
+
+def make_presence_vectorizer():
+    """Binary whitespace-token presence, the basis of the Jaccard score."""
+    return CountVectorizer(
+        binary=True, lowercase=False, tokenizer=str.split,
+        token_pattern=None, dtype=np.int32
+    )
+
+def select_top_k(scores, k=None, min_score=None):
+    """
+    Indices of the k best scores (all of them when k is None), best first,
+    using partial selection (argpartition) instead of a full sort. Scores
+    below min_score are dropped.
+    """
+    if k is not None and k <= 0:
+        return np.zeros(0, dtype=np.int64)
+    candidates = np.arange(len(scores))
+    if min_score is not None:
+        candidates = candidates[scores >= min_score]
+    if k is not None and len(candidates) > k:
+        values = scores[candidates]
+        kth = values[np.argpartition(values, -k)[-k]]
+        # Ties on the k-th score go to the earliest candidates, as in a full stable sort
+        above = candidates[values > kth]
+        candidates = np.sort(np.concatenate([above, candidates[values == kth][:k - len(above)]]))
+    return candidates[np.argsort(-scores[candidates], kind='stable')]
+
+
+class SectionBatch:
+    """
+    Rows of one shared MatrixBuilder for section-weighted scoring: the JD,
+    then per resume its full text followed by each of its non-empty
+    sections. Sections are weighted with the full texts' IDF rather than
+    counted as extra documents. Resumes can be added as they arrive.
+    """
+
+    def __init__(self, jd_text, sections=()):
+        self.sections = tuple(sections)
+        self.builder = MatrixBuilder(tokens=True)
+        self.builder.add(jd_text)
+        self.full_rows = []
+        # (resume, section position, builder row) per non-empty section
+        self.section_rows = []
+
+    def __len__(self):
+        return len(self.full_rows)
+
+    def add(self, text, sections=None):
+        """Adds one resume: its cleaned full text and {section: cleaned text}."""
+        resume = len(self.full_rows)
+        self.full_rows.append(len(self.builder))
+        self.builder.add(text)
+        for j, name in enumerate(self.sections):
+            section_text = (sections or {}).get(name)
+            if section_text:
+                self.section_rows.append((resume, j, len(self.builder)))
+                self.builder.add(section_text, document=False)
+
 
 class MatchingEngine:
-    def __init__(self, config_path="data/config.yaml"):
-        # Load dynamic weights from config
-        with open(config_path, 'r') as f:
-            self.config = yaml.safe_load(f)
-        
-        self.weights = self.config.get('scoring_weights', {})
-        self.scaling = self.weights.get('scaling_factor', 400)
+    def __init__(self, config_path="data/config.yaml", db_path="data/app_db.sqlite"):
+        # Weights come from the shared config service; it only re-reads the
+        # YAML when the file changes, so constructing engines is cheap
+        self.config_path = config_path
+        # Holds the reference IDF model
+        self.db_path = db_path
 
-    def _get_jaccard_similarity(self, text1, text2):
-        """Calculates set-based overlap."""
-        set1, set2 = set(text1.split()), set(text2.split())
-        intersection = len(set1.intersection(set2))
-        union = len(set1.union(set2))
-        return (intersection / union) if union != 0 else 0
+    @property
+    def config(self):
+        return get_config(self.config_path)
 
-    def run_tfidf_match(self, jd_text, resume_texts):
+    @property
+    def section_names(self):
+        """Resume sections scored on their own; empty when only full text is weighted."""
+        # Zero-weight sections would only add rows to vectorize
+        return tuple(s for s, w in self.config.section_weights.items() if s != "full_text" and w > 0)
+
+    def _get_cosine_scores(self, tfidf_matrix):
+        """Cosine of every resume row (1..n) against the JD row (0) in one sparse product."""
+        return (tfidf_matrix[1:] @ tfidf_matrix[0].T).toarray().ravel()
+
+    def _get_jaccard_matrix(self, resume_presence, query_presence):
         """
-        Production-grade TF-IDF matching with explainability.
+        Jaccard of every resume row against every query row (resumes x queries)
+        from binary presence matrices: intersections from one sparse product,
+        unions from the row sizes.
+        """
+        intersection = (resume_presence @ query_presence.T).toarray()
+        union = np.diff(resume_presence.indptr)[:, None] + np.diff(query_presence.indptr)[None, :] - intersection
+        return np.divide(intersection, union, out=np.zeros(union.shape), where=union != 0)
+
+    def _get_top_keywords(self, resume_matrix, jd_vector, feature_names, top_n=5, rows=None):
+        """
+        Top terms per resume ranked by their contribution to the JD cosine
+        (JD weight x resume weight). Works on CSR row data only.
+        `rows` limits the work to those resume indices (in that order).
+        """
+        resume_rows = resume_matrix if rows is None else resume_matrix[rows]
+        contributions = resume_rows.multiply(jd_vector).tocsr()
+        contributions.eliminate_zeros()
+
+        keywords = []
+        for i in range(contributions.shape[0]):
+            start, end = contributions.indptr[i], contributions.indptr[i + 1]
+            data = contributions.data[start:end]
+            if len(data) > top_n:
+                # Partial selection, then order only the winners
+                top = np.argpartition(data, -top_n)[-top_n:]
+            else:
+                top = np.arange(len(data))
+            top = top[np.argsort(data[top])[::-1]]
+            keywords.append([feature_names[idx] for idx in contributions.indices[start:end][top]])
+        return keywords
+
+    def run_batch_match(self, jd_text, resume_texts, top_k=None, min_score=None, timer=None):
+        """
+        Scores a whole batch of resumes against one JD.
+        Each document (text or TokenizedDoc) is tokenized once; TF-IDF and
+        Jaccard are both built from that pass and every cosine comes from a
+        single sparse matrix-vector product.
+        Results are best first; with top_k / min_score only the best
+        candidates are returned and only they get keyword explanations.
+        An optional StageTimer records the "tokenize", "vectorize" and
+        "score" stages.
+        """
+        if not resume_texts:
+            return []
+
+        with timed(timer, "tokenize"):
+            builder = MatrixBuilder(tokens=True).add_many([jd_text] + list(resume_texts))
+        return self.run_builder_match(builder, top_k, min_score, timer)
+
+    def run_builder_match(self, builder, top_k=None, min_score=None, timer=None):
+        """
+        run_batch_match over a MatrixBuilder(tokens=True) whose first
+        document is the JD and the rest resumes. Keeping the builder lets a
+        growing batch be re-ranked without tokenizing anything twice.
+        Rows are TF-IDF weighted vectorize_chunk_size at a time, to bound
+        memory on large batches.
+        """
+        if len(builder) < 2:
+            return []
+
+        with timed(timer, "vectorize"):
+            tfidf_matrix, feature_names, _ = builder.tfidf(chunk_size=self.config.vectorize_chunk_size)
+            presence, _ = builder.presence()
+        with timed(timer, "score"):
+            jac_scores = self._get_jaccard_matrix(presence[1:], presence[:1]).ravel()
+            return self._score_documents(tfidf_matrix, jac_scores, feature_names, top_k, min_score)
+
+    def run_section_match(self, jd_text, resume_texts, resume_sections, top_k=None, min_score=None, timer=None):
+        """
+        Section-weighted run_batch_match. resume_sections holds one
+        {section: cleaned text} dict per resume (e.g. from clean_sections on
+        its parser segments). Without configured section weights this is
+        run_batch_match.
+        """
+        if not resume_texts:
+            return []
+
+        with timed(timer, "tokenize"):
+            batch = SectionBatch(jd_text, self.section_names)
+            for text, sections in zip(resume_texts, resume_sections):
+                batch.add(text, sections)
+        return self.run_section_batch(batch, top_k, min_score, timer)
+
+    def run_section_batch(self, batch, top_k=None, min_score=None, timer=None):
+        """
+        Scores a SectionBatch. The JD, every full text and every section
+        share one TF-IDF matrix, so a single sparse product gives all their
+        cosines; each resume's cosine is then the config.section_weights
+        blend of its full-text and section cosines, the latter multiplied by
+        the fixed config.section_scales factors. Jaccard and keywords use the
+        full text. Results also carry `section_scores`, the raw cosine per
+        section the resume has.
+        """
+        if not batch.sections:
+            return self.run_builder_match(batch.builder, top_k, min_score, timer)
+        if not len(batch):
+            return []
+
+        with timed(timer, "vectorize"):
+            tfidf_matrix, feature_names, _ = batch.builder.tfidf(chunk_size=self.config.vectorize_chunk_size)
+            presence, _ = batch.builder.presence()
+        with timed(timer, "score"):
+            # 1. Cosine of every row (full texts and sections) in one product
+            full_cos, section_cos, present = self._section_cosines(batch, tfidf_matrix)
+
+            # 2. Sections on the full-text scale: a section is a fraction of the
+            #    resume, so its raw cosine runs lower. Each section has one fixed
+            #    factor (fitted offline by fit_section_scales), so a resume's
+            #    score never depends on the rest of the batch.
+            scales = self.config.section_scales
+            scale = np.array([scales.get(s, 1.0) for s in batch.sections])
+            scaled = np.minimum(section_cos * scale, 1.0)
+
+            # 3. Weighted blend; a missing section is neutral and counts as the full-text cosine
+            weights = self.config.section_weights
+            full_weight = weights.get("full_text", 0.0)
+            section_weight = np.array([weights.get(s, 0.0) for s in batch.sections])
+            total = full_weight + section_weight.sum()
+            filled = np.where(present, scaled, full_cos[:, None])
+            cos_scores = (full_weight * full_cos + filled @ section_weight) / total if total > 0 else full_cos
+
+            # 4. Jaccard on the full text
+            full_rows = np.asarray(batch.full_rows)
+            jac_scores = self._get_jaccard_matrix(presence[full_rows], presence[:1]).ravel()
+
+            results = self._rank(cos_scores, jac_scores, tfidf_matrix[full_rows], tfidf_matrix[0],
+                                 feature_names, top_k, min_score)
+        for result in results:
+            i = result["index"]
+            result["section_scores"] = {"full_text": float(full_cos[i])}
+            result["section_scores"].update(
+                (name, float(section_cos[i, j])) for j, name in enumerate(batch.sections) if present[i, j]
+            )
+        return results
+
+    def _section_cosines(self, batch, tfidf_matrix):
         """
-        documents = [jd_text] + resume_texts
-        vectorizer = TfidfVectorizer(stop_words='english', ngram_range=(1, 2))
-        tfidf_matrix = vectorizer.fit_transform(documents)
+        (full-text cosines, resumes x sections cosines, resumes x sections
+        presence mask) of a SectionBatch against its JD row.
+        """
+        row_cos = (tfidf_matrix @ tfidf_matrix[0].T).toarray().ravel()
+        full_cos = row_cos[np.asarray(batch.full_rows)]
+        section_cos = np.zeros((len(batch), len(batch.sections)))
+        present = np.zeros(section_cos.shape, dtype=bool)
+        if batch.section_rows:
+            resumes, positions, rows = np.asarray(batch.section_rows).T
+            section_cos[resumes, positions] = row_cos[rows]
+            present[resumes, positions] = True
+        return full_cos, section_cos, present
+
+    def fit_section_scales(self, jd_texts, resume_texts, resume_sections, sections=None):
+        """
+        Offline calibration for config.section_scales: per section, the
+        total full-text cosine over the total section cosine across every
+        JD x resume pair where the resume has that section. Fit once on a
+        representative sample and store the result; scoring never refits.
+        Returns {section: factor} (sections never seen are left out).
+        """
+        if sections is None:
+            sections = tuple(s for s in self.config.section_weights if s != "full_text")
+        full_sums = np.zeros(len(sections))
+        section_sums = np.zeros(len(sections))
+        for jd_text in jd_texts:
+            batch = SectionBatch(jd_text, sections)
+            for text, resume in zip(resume_texts, resume_sections):
+                batch.add(text, resume)
+            if not len(batch):
+                continue
+            tfidf_matrix, _, _ = batch.builder.tfidf(chunk_size=self.config.vectorize_chunk_size)
+            full_cos, section_cos, present = self._section_cosines(batch, tfidf_matrix)
+            full_sums += present.T @ full_cos
+            section_sums += section_cos.sum(axis=0)
+        return {
+            name: round(float(full_sums[j] / section_sums[j]), 4)
+            for j, name in enumerate(sections) if section_sums[j] > 0
+        }
+
+    def update_model(self, resume_texts):
+        """
+        Folds resumes (texts or TokenizedDocs) into the persisted reference
+        IDF model. Returns how many were new.
+        """
+        return IDFModel(self.db_path).update(resume_texts)
+
+    def run_model_match(self, jd_text, resume_texts, update_model=True, top_k=None, min_score=None):
+        """
+        Scores resumes with the persisted reference IDF model instead of fitting
+        a vectorizer per request. New resumes are folded into the model first.
+        """
+        if not resume_texts:
+            return []
+
+        docs = as_docs([jd_text] + list(resume_texts))
+        model = IDFModel(self.db_path)
+        if update_model:
+            model.update(docs[1:])
+
+        tfidf_matrix, feature_names = model.transform(docs)
+        presence, _ = MatrixBuilder(tokens=True).add_many(docs).presence()
+        jac_scores = self._get_jaccard_matrix(presence[1:], presence[:1]).ravel()
+        return self._score_documents(tfidf_matrix, jac_scores, feature_names, top_k, min_score)
+
+    def _score_documents(self, tfidf_matrix, jac_scores, feature_names, top_k=None, min_score=None):
+        """
+        Blends cosine and Jaccard for rows 1..n against the JD row 0.
+        Each result carries `index`, its position in the resume list.
+        """
+        # 1. Cosine Similarity for every resume at once
+        cos_scores = self._get_cosine_scores(tfidf_matrix)
+
+        # 2. Jaccard Similarity for every resume, computed by the caller
+
+        return self._rank(cos_scores, jac_scores, tfidf_matrix[1:], tfidf_matrix[0], feature_names, top_k, min_score)
+
+    def _rank(self, cos_scores, jac_scores, resume_matrix, jd_vector, feature_names, top_k=None, min_score=None):
+        """
+        Blends the similarity vectors, selects candidates and explains only
+        those. Results are always best first; `index` gives each one's position.
+        """
+        # 3. Weighted Blend from Config
+        config = self.config
+        raw_avg = (cos_scores * config.cosine_weight) + \
+                  (jac_scores * config.jaccard_weight)
+
+        # 4. Final Normalized Score
+        final_scores = np.minimum(np.round(raw_avg * config.scaling, 2), 100)
+
+        # Only the selected candidates are materialised and explained, best first
+        selected = select_top_k(final_scores, top_k, min_score)
         
-        jd_vector = tfidf_matrix[0]
-        feature_names = vectorizer.get_feature_names_out()
+        # 5. Explainability: Top Contributing Keywords
+        top_keywords = self._get_top_keywords(resume_matrix, jd_vector, feature_names, rows=selected)
         
         results = []
-        for i in range(1, len(documents)):
-            # 1. Cosine Similarity
-            cos_score = cosine_similarity(jd_vector, tfidf_matrix[i])[0][0]
-            
-            # 2. Jaccard Similarity
-            jac_score = self._get_jaccard_similarity(jd_text, documents[i])
-            
-            # 3. Weighted Blend from Config
-            raw_avg = (cos_score * self.weights.get('cosine', 0.6)) + \
-                      (jac_score * self.weights.get('jaccard', 0.4))
-            
-            # 4. Final Normalized Score
-            final_score = min(round(raw_avg * self.scaling, 2), 100)
-
-            # 5. Explainability: Top Contributing Keywords
-            # Find words in this resume with highest TF-IDF weight matching the JD
-            row = tfidf_matrix[i].toarray().flatten()
-            top_indices = row.argsort()[-5:][::-1]
-            keywords = [feature_names[idx] for idx in top_indices if row[idx] > 0]
-
+        for i, keywords in zip(selected, top_keywords):
             results.append({
-                "score": final_score,
+                "index": int(i),
+                "score": float(final_scores[i]),
                 "keywords": keywords,
-                "raw_cosine": cos_score
+                "raw_cosine": float(cos_scores[i])
             })
             
-        return results
\ No newline at end of file
+        return results
+
+    def build_corpus_index(self, resume_texts, doc_ids, directory="data/corpus_index", params=None):
+        """
+        Vectorizes a resume corpus once and persists it as a memory-mapped
+        CorpusIndex, so later runs skip re-vectorising entirely. Texts may
+        be an iterator; each is tokenized once and not kept. `params` are
+        recorded in the manifest next to the vectorizer settings.
+        """
+        builder = MatrixBuilder(tokens=True).add_many(resume_texts)
+        tfidf, terms, idf = builder.tfidf(dtype=np.float32, chunk_size=self.config.vectorize_chunk_size)
+        presence, tokens = builder.presence()
+        CorpusIndex.write(
+            directory, tfidf, idf, terms, presence, tokens, doc_ids,
+            params={"stop_words": "english", "ngram_range": [1, 2], **(params or {})}
+        )
+        return CorpusIndex.open(directory)
+
+    def run_index_match(self, jd_text, index, top_k=None, min_score=None):
+        """
+        Scores a JD against a stored CorpusIndex: one transform with the stored
+        IDF weights and one sparse product, no fitting. Results also carry the
+        candidate's `doc_id`.
+        """
+        if not len(index):
+            return []
+
+        jd = as_doc(jd_text)
+
+        # 1. Cosine Similarity: JD in the index's term space, stored IDF weights.
+        #    Built in the mapped matrix's dtype: a mixed-dtype product would
+        #    upcast (and so copy) the whole mapped data array on every query
+        counts = Counter(jd.terms)
+        columns = index.term_columns(counts)
+        cols = list(columns.values())
+        vals = [counts[term] * float(index.idf[col]) for term, col in columns.items()]
+        jd_vector = normalize(csr_matrix(
+            (np.asarray(vals, dtype=index.tfidf.dtype), ([0] * len(cols), cols)),
+            shape=(1, len(index.terms))
+        ), norm='l2', copy=False)
+        cos_scores = (index.tfidf @ jd_vector.T).toarray().ravel()
+
+        # 2. Jaccard Similarity: unseen JD tokens still count towards the union
+        jd_tokens = jd.token_set
+        token_cols = list(index.token_columns(jd_tokens).values())
+        jd_presence = csr_matrix(
+            (np.ones(len(token_cols), dtype=np.float32), ([0] * len(token_cols), token_cols)),
+            shape=(1, len(index.tokens))
+        )
+        intersection = (index.presence @ jd_presence.T).toarray().ravel()
+        union = np.diff(index.presence.indptr) + len(jd_tokens) - intersection
+        jac_scores = np.divide(intersection, union, out=np.zeros(len(union)), where=union != 0)
+
+        results = self._rank(cos_scores, jac_scores, index.tfidf, jd_vector, index.terms, top_k, min_score)
+        for result in results:
+            result["doc_id"] = index.doc_ids[result["index"]]
+        return results
+
+    def run_tfidf_match(self, jd_text, resume_texts):
+        """
+        Production-grade TF-IDF matching with explainability.
+        """
+        return self.run_batch_match(jd_text, resume_texts)
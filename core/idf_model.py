@@ -0,0 +1,112 @@
+# core/idf_model.py
+import hashlib
+import sqlite3
+from collections import Counter
+
+import numpy as np
+from scipy.sparse import csr_matrix
+from sklearn.preprocessing import normalize
+
+from core.tokens import as_doc, smoothed_idf
+
+
+class IDFModel:
+    """
+    Persisted reference corpus statistics in data/app_db.sqlite: document
+    frequency per term, document count and the hashes of already ingested
+    documents. Updates are per-term upserts, so every process adds to the
+    same counts instead of overwriting a snapshot, and a save costs what the
+    new documents cost rather than the whole corpus.
+    Scoring against it is a transform + dot product, no vectorizer fit.
+    """
+
+    def __init__(self, db_path="data/app_db.sqlite"):
+        self.db_path = db_path
+        with self._connect() as conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS idf_terms (term TEXT PRIMARY KEY, df INTEGER NOT NULL)")
+            conn.execute("CREATE TABLE IF NOT EXISTS idf_documents (content_hash TEXT PRIMARY KEY)")
+            # Kept as a counter so reading it never scans idf_documents
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS idf_stats (
+                    id INTEGER PRIMARY KEY CHECK (id = 0),
+                    n_docs INTEGER NOT NULL
+                )
+            """)
+            conn.execute("INSERT OR IGNORE INTO idf_stats (id, n_docs) VALUES (0, 0)")
+
+    def _connect(self):
+        # One short-lived connection per call keeps this safe across Streamlit threads
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    @property
+    def n_docs(self):
+        with self._connect() as conn:
+            return conn.execute("SELECT n_docs FROM idf_stats WHERE id = 0").fetchone()[0]
+
+    def update(self, documents):
+        """
+        Adds unseen documents (texts or TokenizedDocs) to the reference
+        corpus in one transaction. Returns how many were added.
+        """
+        added = 0
+        with self._connect() as conn:
+            for doc in documents:
+                doc = as_doc(doc)
+                digest = hashlib.sha1(doc.text.encode('utf-8')).hexdigest()
+                # OR IGNORE: another process may have counted this document already
+                cur = conn.execute("INSERT OR IGNORE INTO idf_documents (content_hash) VALUES (?)", (digest,))
+                if cur.rowcount == 0:
+                    continue
+                # Same terms as the engine's TF-IDF analyzer, so scores stay comparable
+                conn.executemany(
+                    "INSERT INTO idf_terms (term, df) VALUES (?, 1) "
+                    "ON CONFLICT(term) DO UPDATE SET df = df + 1",
+                    ((term,) for term in set(doc.terms))
+                )
+                added += 1
+            if added:
+                conn.execute("UPDATE idf_stats SET n_docs = n_docs + ? WHERE id = 0", (added,))
+        return added
+
+    def stats(self, terms):
+        """(n_docs, {term: df}) for the given terms, read from one snapshot."""
+        terms = list(terms)
+        doc_freq = {}
+        with self._connect() as conn:
+            conn.execute("BEGIN")
+            n_docs = conn.execute("SELECT n_docs FROM idf_stats WHERE id = 0").fetchone()[0]
+            # Stay well under SQLite's bound-parameter limit
+            for start in range(0, len(terms), 500):
+                chunk = terms[start:start + 500]
+                doc_freq.update(conn.execute(
+                    f"SELECT term, df FROM idf_terms WHERE term IN ({','.join('?' * len(chunk))})", chunk
+                ))
+            conn.rollback()
+        return n_docs, doc_freq
+
+    def transform(self, documents):
+        """
+        L2-normalised TF-IDF rows for the given documents, with sklearn's
+        smoothed IDF over the stored counts. Columns only cover terms present
+        in this batch, so the cost scales with the batch and not with the
+        stored vocabulary.
+        Returns (matrix, feature_names).
+        """
+        counts = [Counter(as_doc(doc).terms) for doc in documents]
+        columns = {}
+        rows, cols, tfs = [], [], []
+        for r, doc_counts in enumerate(counts):
+            for term, tf in doc_counts.items():
+                rows.append(r)
+                cols.append(columns.setdefault(term, len(columns)))
+                tfs.append(tf)
+
+        n_docs, doc_freq = self.stats(columns)
+        idf = smoothed_idf([doc_freq.get(term, 0) for term in columns], n_docs)
+        matrix = csr_matrix(
+            (np.asarray(tfs, dtype=np.float64) * idf[np.asarray(cols, dtype=np.int64)], (rows, cols)),
+            shape=(len(counts), len(columns))
+        )
+        return normalize(matrix, norm='l2', copy=False), list(columns)
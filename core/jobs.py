@@ -0,0 +1,277 @@
+# core/jobs.py
+import json
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from core.engine import MatchingEngine, SectionBatch
+from core.parse_cache import ParseCache
+from core.parser import ResumeParser, _as_payload
+from core.talent_pool import TalentPool
+from core.timing import PerfLog, StageTimer, timed
+from utils.text_utils import clean_sections, clean_text
+
+ACTIVE_STATUSES = ("queued", "running")
+
+# Provisional rankings are recomputed at 8, 16, 32, ... parsed resumes, so the
+# extra scoring work stays below one more full pass however large the batch
+FIRST_RESCORE = 8
+
+
+class BatchJob:
+    """One batch analysis: its inputs, progress and (partial) ranked results."""
+
+    def __init__(self, jd_text, names, payloads, top_k=None, min_score=None):
+        self.id = uuid.uuid4().hex[:12]
+        self.jd_text = jd_text
+        self.names = names
+        self.payloads = payloads
+        self.spool_dir = None
+        self.top_k = top_k
+        self.min_score = min_score
+        self.status = "queued"
+        self.done = 0
+        self.parsed = 0
+        self.results = []
+        self.provisional = True
+        self.errors = []
+        self.timings = None
+        self.created_at = datetime.now().isoformat()
+        self._cancel = threading.Event()
+        self._lock = threading.Lock()
+
+    def cancel(self):
+        self._cancel.set()
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    def update(self, **fields):
+        with self._lock:
+            for key, value in fields.items():
+                setattr(self, key, value)
+
+    def snapshot(self):
+        """Consistent, JSON-serialisable view of the job for the UI and the store."""
+        with self._lock:
+            return {
+                "id": self.id,
+                "status": self.status,
+                "total": len(self.names),
+                "done": self.done,
+                "parsed": self.parsed,
+                "results": list(self.results),
+                "provisional": self.provisional,
+                "errors": list(self.errors),
+                "timings": self.timings,
+                "min_score": self.min_score,
+                "created_at": self.created_at,
+            }
+
+
+class JobStore:
+    """Job snapshots in data/app_db.sqlite, so a refreshed page can reattach to its job."""
+
+    def __init__(self, db_path="data/app_db.sqlite"):
+        self.db_path = db_path
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS batch_jobs (
+                    id TEXT PRIMARY KEY,
+                    status TEXT NOT NULL,
+                    snapshot TEXT NOT NULL,
+                    updated_at TEXT NOT NULL
+                )
+            """)
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def save(self, snapshot):
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO batch_jobs VALUES (?, ?, ?, ?)",
+                (snapshot["id"], snapshot["status"], json.dumps(snapshot), datetime.now().isoformat())
+            )
+
+    def load(self, job_id):
+        with self._connect() as conn:
+            row = conn.execute("SELECT snapshot FROM batch_jobs WHERE id = ?", (job_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+
+class JobQueue:
+    """
+    Runs batch analyses on background threads so they survive Streamlit
+    reruns and never block the script thread. Each job parses in
+    ResumeParser's process pool; max_workers jobs run at once.
+    """
+
+    def __init__(self, max_workers=2, db_path="data/app_db.sqlite", config_path="data/config.yaml"):
+        self.db_path = db_path
+        self.config_path = config_path
+        self.store = JobStore(db_path)
+        # Shared by every job; none of them keep per-run state
+        self.engine = MatchingEngine(config_path, db_path)
+        self.parser = ResumeParser()
+        self.parse_cache = ParseCache(db_path)
+        self._jobs = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="batch-job")
+
+    def submit(self, jd_text, files, top_k=None, min_score=None):
+        """
+        Queues a batch of uploads (or paths) against a JD. Returns the job id.
+        Upload bytes are held in memory up to the configured spool threshold
+        per job; uploads past that budget are written to a temporary
+        directory, so the job holds paths instead of a second in-memory copy.
+        """
+        names = [getattr(f, "name", str(f)) for f in files]
+        budget = self.engine.config.spool_threshold
+        spool_dir, held, payloads = None, 0, []
+        for i, f in enumerate(files):
+            payload = _as_payload(f)
+            if isinstance(payload, bytes):
+                if held + len(payload) > budget:
+                    spool_dir = spool_dir or tempfile.mkdtemp(prefix="resume-spool-")
+                    payload = _spool(payload, spool_dir, i)
+                else:
+                    held += len(payload)
+            payloads.append(payload)
+        job = BatchJob(jd_text, names, payloads, top_k, min_score)
+        job.spool_dir = spool_dir
+        with self._lock:
+            self._jobs[job.id] = job
+        self.store.save(job.snapshot())
+        self._executor.submit(self._run, job)
+        return job.id
+
+    def get(self, job_id):
+        """Latest snapshot of a job, or None. Jobs from a previous server run come back "interrupted"."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job is not None:
+            return job.snapshot()
+        snapshot = self.store.load(job_id)
+        if snapshot and snapshot["status"] in ACTIVE_STATUSES:
+            snapshot["status"] = "interrupted"
+        return snapshot
+
+    def cancel(self, job_id):
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job is not None:
+            job.cancel()
+
+    def _run(self, job):
+        try:
+            self._process(job)
+        except Exception as e:
+            job.update(status="failed", errors=job.errors + [f"Analysis failed: {e}"])
+        finally:
+            # Finished jobs are served from the store; only active ones stay in memory
+            job.payloads = None
+            if job.spool_dir:
+                shutil.rmtree(job.spool_dir, ignore_errors=True)
+            self.store.save(job.snapshot())
+            with self._lock:
+                self._jobs.pop(job.id, None)
+
+    def _process(self, job):
+        if job.cancelled:
+            job.update(status="cancelled")
+            return
+        job.update(status="running")
+        self.store.save(job.snapshot())
+
+        engine = self.engine
+        timer = StageTimer()
+        # Each document (and section) is tokenized once, as it arrives; rescoring reuses the tokens
+        batch = SectionBatch(clean_text(job.jd_text), engine.section_names)
+        parsed = []
+        next_rescore = FIRST_RESCORE
+
+        # Stage 1: parse in completion order, publishing a provisional ranking as the batch grows
+        stream = self.parse_cache.parse_many(
+            self.parser, job.payloads, timer=timer, labels=job.names,
+            chunk_size=engine.config.ingest_chunk_size
+        )
+        for done, (idx, record, error) in enumerate(stream, 1):
+            # The PDF is no longer needed once parsed
+            job.payloads[idx] = None
+            if error:
+                job.update(errors=job.errors + [f"{job.names[idx]}: {error}"])
+            else:
+                parsed.append({"name": job.names[idx].replace('.pdf', ''), "record": record})
+                with timed(timer, "clean", job.names[idx]):
+                    sections = clean_sections(record['segments'], batch.sections)
+                with timed(timer, "tokenize", job.names[idx]):
+                    batch.add(record['cleaned'], sections)
+            job.update(done=done, parsed=len(parsed))
+            if job.cancelled:
+                # Closing the stream cancels the parses that have not started
+                stream.close()
+                break
+            if len(parsed) >= next_rescore:
+                with timed(timer, "provisional_score"):
+                    job.update(results=self._rank(engine, batch, parsed, job))
+                self.store.save(job.snapshot())
+                next_rescore *= 2
+
+        # Keep every parsed resume searchable in the talent pool and counted in
+        # the reference IDF model. Both are side effects: a failure is reported
+        # with the job but never costs it its results.
+        try:
+            with timed(timer, "pool_ingest"):
+                TalentPool(self.db_path).add_many(parsed)
+            with timed(timer, "model_update"):
+                engine.update_model([entry['record']['cleaned'] for entry in parsed])
+        except Exception as e:
+            job.update(errors=job.errors + [f"Talent pool not updated: {e}"])
+
+        # Stage 2: the final ranking is one fit over everything parsed, as in a synchronous run
+        results = self._rank(engine, batch, parsed, job, timer)
+        PerfLog(self.db_path).record(timer, view="batch_job", n_files=len(job.names))
+        job.update(
+            results=results, provisional=False, timings=timer.to_dict(),
+            status="cancelled" if job.cancelled else "done"
+        )
+
+    def _rank(self, engine, batch, parsed, job, timer=None):
+        shortlist = engine.run_section_batch(batch, top_k=job.top_k, min_score=job.min_score, timer=timer)
+        return [
+            {"name": parsed[m['index']]['name'], "contact": parsed[m['index']]['record']['contact'], "match": m}
+            for m in shortlist
+        ]
+
+
+def _spool(upload, directory, i):
+    """Writes one upload to directory and returns its path; paths pass through."""
+    payload = _as_payload(upload)
+    if not isinstance(payload, bytes):
+        return payload
+    path = os.path.join(directory, f"{i:06d}.pdf")
+    with open(path, 'wb') as f:
+        f.write(payload)
+    return path
+
+
+_queue = None
+_queue_lock = threading.Lock()
+
+
+def get_job_queue():
+    """The process-wide job queue, shared by every Streamlit session."""
+    global _queue
+    with _queue_lock:
+        if _queue is None:
+            _queue = JobQueue()
+        return _queue
@@ -0,0 +1,285 @@
+# core/parse_cache.py
+import hashlib
+import json
+import sqlite3
+import threading
+from collections import OrderedDict, deque
+from datetime import datetime
+
+from core.parser import PARSER_VERSION, ResumeParser, _as_payload
+from core.timing import timed
+from utils.contact_utils import extract_contact_info, get_contact_window
+from utils.text_utils import get_normalizer
+
+
+# Budget for parse records held in memory in front of SQLite
+MEMORY_CACHE_BYTES = 256 * 1024 * 1024
+
+
+def content_hash(data):
+    """Content address of a PDF: sha256 of its raw bytes."""
+    return hashlib.sha256(data).hexdigest()
+
+
+class ParseLRU:
+    """
+    Thread-safe in-memory LRU of parse records keyed by content hash, bounded
+    by the total size of the text it holds rather than by entry count, so a
+    few huge CVs cannot crowd out memory. Records are shared, never copied:
+    callers must not mutate them.
+    """
+
+    def __init__(self, max_bytes=MEMORY_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get_many(self, digests):
+        found = {}
+        with self._lock:
+            for digest in digests:
+                entry = self._entries.get(digest)
+                if entry is not None:
+                    self._entries.move_to_end(digest)
+                    found[digest] = entry[0]
+        return found
+
+    def put(self, digest, record):
+        size = _record_size(record)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(digest, None)
+            if old is not None:
+                self.size -= old[1]
+            self._entries[digest] = (record, size)
+            self.size += size
+            while self.size > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self.size -= evicted
+
+
+def _record_size(record):
+    """Approximate footprint of a record: the text it holds."""
+    segments = record["segments"]
+    text = sum(len(v) for v in segments.values() if isinstance(v, str))
+    return text + len(record["cleaned"]) + 64 * (len(segments.get("offsets", {})) + 4)
+
+
+# One per process, shared by every ParseCache (and so every Streamlit session)
+_memory_cache = ParseLRU()
+
+
+class ParseCache:
+    """
+    Parse results keyed by PDF content hash + parser version, stored in
+    data/app_db.sqlite behind an in-memory LRU. Re-screening the same PDFs
+    skips extraction entirely; recently seen ones skip SQLite too.
+    Cleaned text records the normalizer that produced it; a hit cleaned by
+    another one (e.g. after a taxonomy edit) is re-cleaned from its segments,
+    and contact details found with another search window are looked up
+    again. A record extracted under other page/character caps is a miss.
+    """
+
+    def __init__(self, db_path="data/app_db.sqlite", memory=None, normalizer=None, contact_window=None):
+        self.db_path = db_path
+        self.memory = memory if memory is not None else _memory_cache
+        self._normalizer = normalizer
+        self._contact_window = contact_window
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS parse_cache (
+                    content_hash TEXT NOT NULL,
+                    parser_version INTEGER NOT NULL,
+                    segments TEXT NOT NULL,
+                    cleaned_text TEXT NOT NULL,
+                    contact TEXT NOT NULL,
+                    created_at TEXT NOT NULL,
+                    PRIMARY KEY (content_hash, parser_version)
+                )
+            """)
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(parse_cache)")}
+            if "normalizer" not in columns:
+                conn.execute("ALTER TABLE parse_cache ADD COLUMN normalizer TEXT NOT NULL DEFAULT ''")
+            # The extraction caps and contact window a record was built with
+            if "parse_params" not in columns:
+                conn.execute("ALTER TABLE parse_cache ADD COLUMN parse_params TEXT NOT NULL DEFAULT ''")
+            if "contact_window" not in columns:
+                conn.execute("ALTER TABLE parse_cache ADD COLUMN contact_window INTEGER NOT NULL DEFAULT -1")
+
+    @property
+    def normalizer(self):
+        # Resolved per call so config reloads are picked up
+        return self._normalizer or get_normalizer()
+
+    @property
+    def contact_window(self):
+        return self._contact_window if self._contact_window is not None else get_contact_window()
+
+    def _connect(self):
+        # One short-lived connection per call keeps this safe across Streamlit threads
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def get(self, digest, parser=None):
+        """Returns the cached record for a content hash, or None."""
+        return self.get_many([digest], parser).get(digest)
+
+    def get_many(self, digests, parser=None):
+        """
+        Looks up many content hashes at once. Returns {digest: record} for
+        the hits extracted with parser's caps (a default ResumeParser's if None).
+        """
+        normalizer, contact_window = self.normalizer, self.contact_window
+        params = parse_params(parser or ResumeParser())
+        found = {digest: self._fresh(digest, record, normalizer, contact_window)
+                 for digest, record in self.memory.get_many(set(digests)).items()
+                 if record.get("parse_params") == params}
+        unique = list(set(digests) - found.keys())
+        if not unique:
+            return found
+        with self._connect() as conn:
+            # Stay well under SQLite's bound-parameter limit
+            for start in range(0, len(unique), 500):
+                chunk = unique[start:start + 500]
+                rows = conn.execute(
+                    "SELECT content_hash, segments, cleaned_text, contact, normalizer, contact_window "
+                    "FROM parse_cache WHERE parser_version = ? AND parse_params = ? "
+                    f"AND content_hash IN ({','.join('?' * len(chunk))})",
+                    [PARSER_VERSION, params] + chunk
+                ).fetchall()
+                for digest, segments, cleaned, contact, signature, window in rows:
+                    record = {"segments": json.loads(segments), "cleaned": cleaned,
+                              "contact": json.loads(contact), "normalizer": signature,
+                              "contact_window": window, "parse_params": params}
+                    if signature == normalizer.signature and window == contact_window:
+                        self.memory.put(digest, record)
+                    found[digest] = self._fresh(digest, record, normalizer, contact_window)
+        return found
+
+    def _fresh(self, digest, record, normalizer, contact_window):
+        """
+        record, re-cleaned if another normalizer produced its text and with
+        its contact re-extracted if another window was searched; written back
+        if either changed.
+        """
+        updates = {}
+        full_text = record["segments"]["full_text"]
+        if record.get("normalizer") != normalizer.signature:
+            updates.update(cleaned=normalizer.clean(full_text), normalizer=normalizer.signature)
+        if record.get("contact_window") != contact_window:
+            updates.update(contact=extract_contact_info(full_text, contact_window), contact_window=contact_window)
+        if not updates:
+            return record
+        record = dict(record, **updates)
+        self.put(digest, record)
+        return record
+
+    def put(self, digest, record):
+        self.memory.put(digest, record)
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO parse_cache "
+                "(content_hash, parser_version, segments, cleaned_text, contact, created_at, normalizer, "
+                "parse_params, contact_window) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (digest, PARSER_VERSION, json.dumps(record["segments"]), record["cleaned"],
+                 json.dumps(record["contact"]), datetime.now().isoformat(), record["normalizer"],
+                 record["parse_params"], record["contact_window"])
+            )
+
+    def parse_many(self, parser, pdf_files, timer=None, labels=None, chunk_size=None, **parse_kwargs):
+        """
+        Cache-aware ResumeParser.parse_many. Yields (index, record, error) where
+        record holds segments, cleaned text, contact info and the content hash.
+        Misses are parsed in parallel and written back.
+        With chunk_size, files are read, hashed and looked up that many at a
+        time, and misses are streamed into one parser pool with at most
+        chunk_size in flight, so only about two chunks of PDF bytes are in
+        memory; paths are hashed from disk in blocks and handed to the
+        workers as paths.
+        An optional StageTimer records cache lookup, parse, clean and contact
+        stages, per file under labels[index] (or the index).
+        """
+        labels = list(labels) if labels is not None else list(range(len(pdf_files)))
+        step = chunk_size or max(len(pdf_files), 1)
+        # Hits found while the parser pulls the next misses, waiting to be yielded
+        ready = deque()
+        misses, miss_labels, digests = [], [], {}
+
+        def miss_payloads():
+            for start in range(0, len(pdf_files), step):
+                indices = range(start, min(start + step, len(pdf_files)))
+                with timed(timer, "cache_lookup"):
+                    payloads = {i: _as_payload(pdf_files[i]) for i in indices}
+                    chunk_digests = {i: _digest(payload) for i, payload in payloads.items()}
+                    hits = self.get_many(chunk_digests.values(), parser)
+                for i, digest in chunk_digests.items():
+                    if digest in hits:
+                        ready.append((i, dict(hits[digest], content_hash=digest), None))
+                    else:
+                        misses.append(i)
+                        miss_labels.append(labels[i])
+                        digests[i] = digest
+                        yield payloads.pop(i)
+
+        normalizer, contact_window = self.normalizer, self.contact_window
+        params = parse_params(parser)
+        parsed = parser.parse_many(miss_payloads(), timer=timer, labels=miss_labels, max_in_flight=step,
+                                   **parse_kwargs)
+        try:
+            for j, segments, error in parsed:
+                while ready:
+                    yield ready.popleft()
+                i = misses[j]
+                digest = digests.pop(i)
+                if error:
+                    yield i, None, error
+                    continue
+                record = dict(build_record(segments, timer, labels[i], normalizer, contact_window),
+                              parse_params=params)
+                with timed(timer, "cache_write"):
+                    self.put(digest, record)
+                yield i, dict(record, content_hash=digest), None
+        finally:
+            # Stopping early (e.g. a cancelled job) cancels the parses not yet started
+            parsed.close()
+        while ready:
+            yield ready.popleft()
+
+
+def _digest(payload):
+    """content_hash of in-memory bytes, or of a file read in blocks."""
+    if isinstance(payload, bytes):
+        return content_hash(payload)
+    digest = hashlib.sha256()
+    with open(payload, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def parse_params(parser):
+    """The extraction caps a parse depends on, as stored with cached records."""
+    return f"{parser.max_pages}:{parser.max_chars}"
+
+
+def build_record(segments, timer=None, item=None, normalizer=None, contact_window=None):
+    """Everything downstream needs from one parsed resume."""
+    normalizer = normalizer or get_normalizer()
+    contact_window = get_contact_window() if contact_window is None else contact_window
+    with timed(timer, "clean", item):
+        cleaned = normalizer.clean(segments['full_text'])
+    with timed(timer, "contact", item):
+        contact = extract_contact_info(segments['full_text'], contact_window)
+    return {
+        "segments": segments,
+        "cleaned": cleaned,
+        "contact": contact,
+        "normalizer": normalizer.signature,
+        "contact_window": contact_window
+    }
@@ -1,31 +1,279 @@
+import collections
+import io
+import itertools
+import multiprocessing
+import os
 import re
+import signal
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
 from pypdf import PdfReader
 
+# Bump whenever parse() output changes so cached results are invalidated
+PARSER_VERSION = 4
+
+# Header alternatives per section; each becomes a named group in SECTION_HEADER_RE
+SECTION_MAP = {
+    "experience": r"experience|work\s+history|employment(?:\s+history)?|professional\s+background",
+    "education": r"education|academics?|certifications?|degrees?|qualifications",
+    "skills": r"skills|competencies|expertise|tools|technologies",
+    "projects": r"projects|personal\s+work|portfolio"
+}
+
+# Qualifiers allowed in front of a header word ("work", "technical", ...)
+_QUALIFIERS = (
+    r"(?:(?:work|professional|relevant|technical|core|key|personal|selected|academic|career|additional|other)\s+){0,2}"
+)
+
+# Header words that may follow the section's own in a combined header
+# ("Skills & Expertise", "Projects and Achievements"); they do not start a section
+_TAIL_WORDS = "|".join(SECTION_MAP.values()) + (
+    r"|achievements|awards|honou?rs|interests|languages|training|courses|publications|activities|leadership"
+)
+
+# One anchored pattern for the whole line: optional bullet/numbering, up to two
+# qualifiers, the header word, and up to two "& <header word>" tails. Body
+# text like "experience with tools" or "tools and technologies used daily"
+# does not match.
+SECTION_HEADER_RE = re.compile(
+    r"^[\W\d_]*" + _QUALIFIERS +
+    r"(?:" + "|".join(f"(?P<{name}>{alts})" for name, alts in SECTION_MAP.items()) + r")"
+    r"(?:\s*(?:&|and|/|,)\s*" + _QUALIFIERS + r"(?:" + _TAIL_WORDS + r")){0,2}"
+    r"[\s:\-\u2013\u2014]*$",
+    re.IGNORECASE
+)
+
+# Longer lines are body text; skip the regex for them entirely
+MAX_HEADER_LEN = 60
+
+# Pools are started from threaded servers (Streamlit script threads, JobQueue
+# workers). A forked child can deadlock on a lock some other thread held at
+# fork time (sqlite, logging), so workers come from a forkserver instead
+_MP_CONTEXT = multiprocessing.get_context(
+    "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+)
+
+
 class ResumeParser:
-    def __init__(self):
-        self.section_map = {
-            "experience": r"(experience|work history|employment|professional background)",
-            "education": r"(education|academic|certification|degree)",
-            "skills": r"(technical skills|competencies|expertise|tools)",
-            "projects": r"(projects|personal work|portfolio)"
-        }
+    def __init__(self, max_pages=20, max_chars=60000):
+        self.section_map = SECTION_MAP
+        # Caps for very long CVs: text past these adds latency but no ranking signal
+        self.max_pages = max_pages
+        self.max_chars = max_chars
 
-    def parse(self, pdf_file): # Ensure this name is exactly 'parse'
-        """Extracts text and segments it into logical sections."""
+    def iter_pages(self, pdf_file):
+        """Yields page texts one at a time, stopping at the page and character caps."""
         reader = PdfReader(pdf_file)
-        full_text = ""
-        for page in reader.pages:
-            full_text += page.extract_text() + "\n"
-        
-        segments = {"full_text": full_text, "experience": "", "education": "", "skills": "", "projects": ""}
-        current_section = "full_text"
-        
-        for line in full_text.split('\n'):
-            clean_line = line.strip().lower()
-            for section, pattern in self.section_map.items():
-                if re.search(pattern, clean_line):
-                    current_section = section
-                    break
-            segments[current_section] += line + " "
-            
-        return segments
\ No newline at end of file
+        remaining = self.max_chars
+        for page_no, page in enumerate(reader.pages):
+            if self.max_pages is not None and page_no >= self.max_pages:
+                return
+            text = (page.extract_text() or "") + "\n"
+            if remaining is not None:
+                text = text[:remaining]
+                remaining -= len(text)
+            yield text
+            if remaining is not None and remaining <= 0:
+                return
+
+    def iter_lines(self, pdf_file, pages=None):
+        """
+        Yields lines as pages are extracted, without building the full text first.
+        If `pages` is a list, each page text is also appended to it.
+        """
+        carry = ""
+        for text in self.iter_pages(pdf_file):
+            if pages is not None:
+                pages.append(text)
+            lines = (carry + text).split('\n')
+            carry = lines.pop()
+            yield from lines
+        yield carry
+
+    def segment_offsets(self, full_text):
+        """
+        Single pass over the lines of full_text. Returns {section: [[start, end], ...]}
+        character offsets; a section may appear more than once in a resume.
+        """
+        return self.segment_lines(full_text.split('\n'))
+
+    def segment_lines(self, lines):
+        """
+        segment_offsets over an iterable of lines (without their newlines),
+        e.g. iter_lines(), so a resume is segmented as its pages are extracted.
+        """
+        offsets = {section: [] for section in SECTION_MAP}
+        current, start, pos = None, 0, 0
+        for line in lines:
+            if len(line) <= MAX_HEADER_LEN:
+                match = SECTION_HEADER_RE.match(line.strip())
+                if match:
+                    if current:
+                        offsets[current].append([start, pos])
+                    current, start = match.lastgroup, pos
+            pos += len(line) + 1
+        if current:
+            # The last line has no newline after it
+            offsets[current].append([start, max(pos - 1, start)])
+        return offsets
+
+    def parse(self, pdf_file): # Ensure this name is exactly 'parse'
+        """
+        Extracts text and segments it into logical sections as pages arrive.
+        Returns {"full_text", "offsets"}; section texts are sliced from the
+        offsets on demand (see utils.text_utils.section_text).
+        """
+        pages = []
+        offsets = self.segment_lines(self.iter_lines(pdf_file, pages))
+        return {"full_text": "".join(pages), "offsets": offsets}
+
+    def parse_many(self, pdf_files, max_workers=None, timeout=30, timer=None, labels=None, max_in_flight=None):
+        """
+        Parses many PDFs in a process pool.
+        Yields (index, segments, error) in completion order, where index is the
+        position in pdf_files. A file that fails or exceeds `timeout` seconds
+        only produces an error for itself.
+        pdf_files may be any iterable; it is consumed lazily, keeping at most
+        max_in_flight files (at least one per worker) submitted at a time,
+        so one pool serves a whole stream without holding all of it.
+        With a StageTimer, each file's worker-side wall/CPU time is recorded
+        as its "parse" stage, under labels[index] (or the index).
+        """
+        files = enumerate(pdf_files)
+
+        def result(i, segments, error, wall, cpu):
+            if timer is not None:
+                timer.add("parse", wall, cpu, labels[i] if labels is not None else i)
+            return i, segments, error
+        if max_workers is None:
+            max_workers = os.cpu_count() or 1
+
+        # Not worth spinning up a pool for a single file, as long as this
+        # thread can still enforce the timeout itself
+        head = list(itertools.islice(files, 2))
+        if (len(head) <= 1 or max_workers <= 1) and _can_enforce(timeout):
+            for i, pdf_file in itertools.chain(head, files):
+                yield result(i, *_timed_parse_payload(_as_payload(pdf_file), timeout, self.max_pages, self.max_chars))
+            return
+        if len(head) <= 1:
+            max_workers = 1
+        files = itertools.chain(head, files)
+        limit = max(max_in_flight or float('inf'), max_workers)
+
+        # A crashed worker breaks the whole pool. Files it took down are
+        # re-parsed one at a time (see _isolate), then a fresh pool carries on
+        # with the rest of the stream
+        while True:
+            broken = []
+            with ProcessPoolExecutor(max_workers=max_workers, mp_context=_MP_CONTEXT) as pool:
+                futures = {}
+                try:
+                    while True:
+                        # Top up the in-flight window, then wait for the next completion
+                        while not broken and len(futures) < limit:
+                            item = next(files, None)
+                            if item is None:
+                                break
+                            i, payload = item[0], _as_payload(item[1])
+                            try:
+                                future = pool.submit(_timed_parse_payload, payload, timeout,
+                                                     self.max_pages, self.max_chars)
+                            except BrokenProcessPool:
+                                broken.append((i, payload))
+                                break
+                            futures[future] = (i, payload)
+                        if not futures:
+                            break
+                        done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            i, payload = futures.pop(future)
+                            try:
+                                outcome = future.result()
+                            except BrokenProcessPool:
+                                broken.append((i, payload))
+                                continue
+                            yield result(i, *outcome)
+                finally:
+                    # If the caller stops early (e.g. a cancelled job), drop queued files
+                    # instead of waiting for the pool to parse them on shutdown
+                    for future in futures:
+                        future.cancel()
+            if not broken:
+                return
+            for i, *outcome in self._isolate(broken, timeout):
+                yield result(i, *outcome)
+
+    def _isolate(self, suspects, timeout):
+        """
+        Re-parses files that were in flight when a pool broke, one at a time
+        in a single-worker pool, so a crash only fails the file that caused
+        it. Yields (index, segments, error, wall, cpu).
+        """
+        suspects = collections.deque(suspects)
+        while suspects:
+            with ProcessPoolExecutor(max_workers=1, mp_context=_MP_CONTEXT) as pool:
+                while suspects:
+                    i, payload = suspects.popleft()
+                    try:
+                        outcome = pool.submit(_timed_parse_payload, payload, timeout,
+                                              self.max_pages, self.max_chars).result()
+                    except BrokenProcessPool:
+                        yield i, None, "Parser process crashed", 0.0, 0.0
+                        # The pool is gone; the remaining suspects get a fresh one
+                        break
+                    yield (i, *outcome)
+
+
+def _as_payload(pdf_file):
+    """Turns an upload or path into something that can be sent to a worker process."""
+    if isinstance(pdf_file, (str, bytes, os.PathLike)):
+        return pdf_file
+    if hasattr(pdf_file, "getvalue"):
+        return pdf_file.getvalue()
+    return pdf_file.read()
+
+
+class _ParseTimeout(Exception):
+    pass
+
+
+def _raise_timeout(signum, frame):
+    raise _ParseTimeout()
+
+
+def _can_enforce(timeout):
+    """
+    Whether a parse in this thread can be held to `timeout`. SIGALRM only
+    exists on Unix and only works in the main thread; elsewhere (e.g. a
+    Streamlit script thread or a job worker) files must go to a pool.
+    """
+    return not timeout or (hasattr(signal, "setitimer") and threading.current_thread() is threading.main_thread())
+
+
+def _parse_payload(payload, timeout, max_pages=20, max_chars=60000):
+    """Worker entry point. Returns (segments, error) and never raises."""
+    source = io.BytesIO(payload) if isinstance(payload, bytes) else payload
+    use_alarm = bool(timeout) and _can_enforce(timeout)
+    if use_alarm:
+        previous = signal.signal(signal.SIGALRM, _raise_timeout)
+        # setitimer, unlike alarm, keeps fractional timeouts
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        return ResumeParser(max_pages, max_chars).parse(source), None
+    except _ParseTimeout:
+        return None, f"Timed out after {timeout}s"
+    except Exception as e:
+        return None, str(e)
+    finally:
+        if use_alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, previous)
+
+
+def _timed_parse_payload(payload, timeout, max_pages=20, max_chars=60000):
+    """_parse_payload plus the wall/CPU seconds it took in the worker."""
+    wall, cpu = time.perf_counter(), time.process_time()
+    segments, error = _parse_payload(payload, timeout, max_pages, max_chars)
+    return segments, error, time.perf_counter() - wall, time.process_time() - cpu
@@ -1,4 +1,7 @@
-# A database of tech skills to look for
+import re
+from collections import deque
+
+# Fallback when the config has no taxonomy
 TECH_SKILLS_DB = {
     "python", "java", "c++", "javascript", "typescript", "html", "css",
     "react", "angular", "vue", "node", "django", "flask",
@@ -7,21 +10,96 @@ TECH_SKILLS_DB = {
     "machine learning", "deep learning", "nlp", "tensorflow", "pytorch"
 }
 
-def extract_skills(text):
+# Tokens keep inner '.', '-' and trailing '+'/'#' so "c++", "c#", "node.js"
+# and "scikit-learn" survive, while sentence punctuation is dropped
+TOKEN_RE = re.compile(r"[a-z0-9+#]+(?:[.\-][a-z0-9+#]+)*")
+
+
+def tokenize(text):
+    return TOKEN_RE.findall(text.lower())
+
+
+class SkillMatcher:
+    """
+    Aho-Corasick automaton over token sequences. Matching is one pass over the
+    tokens of a text, so cost does not grow with the taxonomy size, and
+    matches always fall on token boundaries ("java" never hits "javascript").
+    """
+
+    def __init__(self, taxonomy):
+        # Accept either {category: [skills]} or a flat iterable of skills
+        if isinstance(taxonomy, dict):
+            pairs = [(skill, category) for category, skills in taxonomy.items() for skill in skills]
+        else:
+            pairs = [(skill, None) for skill in taxonomy]
+
+        self.categories = {}
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [[]]
+        for skill, category in pairs:
+            tokens = tokenize(skill)
+            if not tokens:
+                continue
+            self.categories.setdefault(skill, category)
+            self._add(tokens, skill)
+        self._build_links()
+
+    def _add(self, tokens, skill):
+        node = 0
+        for token in tokens:
+            nxt = self._goto[node].get(token)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][token] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            node = nxt
+        if skill not in self._out[node]:
+            self._out[node].append(skill)
+
+    def _build_links(self):
+        """Breadth-first failure links; outputs are merged along them."""
+        # Depth-1 nodes keep the root (0) as their failure link
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for token, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and token not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[child] = self._goto[fail].get(token, 0)
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+
+    def find_tokens(self, tokens):
+        """Skills found in a token list, unique, in order of first occurrence."""
+        goto, fail, out = self._goto, self._fail, self._out
+        found = {}
+        node = 0
+        for token in tokens:
+            while node and token not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(token, 0)
+            for skill in out[node]:
+                found.setdefault(skill, None)
+        return list(found)
+
+    def find(self, text):
+        """Skills found in free text."""
+        return self.find_tokens(tokenize(text))
+
+
+def get_skill_matcher(config_path="data/config.yaml"):
+    """Matcher compiled from the config taxonomy, shared through the config service."""
+    from core.config import get_config  # core.config imports this module
+    return get_config(config_path).skill_matcher
+
+
+def extract_skills(text, matcher=None):
     """
-    Scans text and returns a set of found skills from our DB.
+    Scans text and returns the list of taxonomy skills found in it.
     """
-    found_skills = set()
-    words = text.split()
-    
-    # Check for single-word skills
-    for word in words:
-        if word in TECH_SKILLS_DB:
-            found_skills.add(word)
-            
-    # Check for multi-word skills (like 'machine learning')
-    for skill in TECH_SKILLS_DB:
-        if " " in skill and skill in text:
-            found_skills.add(skill)
-            
-    return list(found_skills)
\ No newline at end of file
+    matcher = matcher or get_skill_matcher()
+    return matcher.find(text)
@@ -0,0 +1,160 @@
+# core/talent_pool.py
+import json
+import sqlite3
+from datetime import datetime
+
+from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS
+
+from core.parser import SECTION_MAP
+from utils.text_utils import clean_sections, clean_text
+
+# Sections indexed as their own FTS5 columns, after the cleaned full text
+FTS_SECTIONS = ("experience", "skills", "projects")
+
+# bm25 column weights: full_text, experience, skills, projects
+BM25_WEIGHTS = "bm25(1.0, 1.5, 2.0, 1.0)"
+
+
+class TalentPool:
+    """
+    Every ingested resume, persisted in data/app_db.sqlite with an FTS5
+    inverted index over cleaned text and sections. A JD can then be run
+    against the whole stored pool without re-uploading PDFs.
+    """
+
+    def __init__(self, db_path="data/app_db.sqlite"):
+        self.db_path = db_path
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS candidates (
+                    id INTEGER PRIMARY KEY,
+                    content_hash TEXT NOT NULL UNIQUE,
+                    name TEXT NOT NULL,
+                    email TEXT,
+                    phone TEXT,
+                    cleaned_text TEXT NOT NULL,
+                    ingested_at TEXT NOT NULL
+                )
+            """)
+            # Cleaned parser sections as JSON, for section-weighted re-scoring
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(candidates)")}
+            if "sections" not in columns:
+                conn.execute("ALTER TABLE candidates ADD COLUMN sections TEXT NOT NULL DEFAULT '{}'")
+            exists = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE name = 'candidate_fts'"
+            ).fetchone()
+            if not exists:
+                # Contentless: the text already lives in `candidates`
+                conn.execute(
+                    "CREATE VIRTUAL TABLE candidate_fts USING fts5("
+                    f"full_text, {', '.join(FTS_SECTIONS)}, content='')"
+                )
+                conn.execute(
+                    "INSERT INTO candidate_fts(candidate_fts, rank) VALUES ('rank', ?)",
+                    (BM25_WEIGHTS,)
+                )
+            # Per-term document frequencies, used to pick selective query terms
+            conn.execute(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS candidate_fts_vocab "
+                "USING fts5vocab(candidate_fts, 'row')"
+            )
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def count(self):
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM candidates").fetchone()[0]
+
+    def add_many(self, entries):
+        """
+        Ingests parsed resumes. Each entry is {"name", "record"} where record is
+        a parse-cache record (segments, cleaned, contact, content_hash).
+        Resumes already in the pool are skipped. Returns how many were added.
+        """
+        added = 0
+        now = datetime.now().isoformat()
+        with self._connect() as conn:
+            for entry in entries:
+                record = entry['record']
+                contact = record.get('contact', {})
+                sections = clean_sections(record.get('segments', {}), tuple(SECTION_MAP))
+                # OR IGNORE: concurrent jobs may ingest the same PDF
+                cur = conn.execute(
+                    "INSERT OR IGNORE INTO candidates "
+                    "(content_hash, name, email, phone, cleaned_text, ingested_at, sections) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (record['content_hash'], entry['name'], contact.get('email'),
+                     contact.get('phone'), record['cleaned'], now, json.dumps(sections))
+                )
+                if cur.rowcount == 0:
+                    continue
+                conn.execute(
+                    f"INSERT INTO candidate_fts(rowid, full_text, {', '.join(FTS_SECTIONS)}) "
+                    f"VALUES (?, ?, {', '.join('?' * len(FTS_SECTIONS))})",
+                    [cur.lastrowid, record['cleaned']] + [sections[s] for s in FTS_SECTIONS]
+                )
+                added += 1
+        return added
+
+    def search(self, jd_text, engine, top_k=20, shortlist_factor=5, max_terms=24, max_df_ratio=0.05):
+        """
+        Ranks the stored pool against a JD. FTS5/bm25 retrieves a shortlist
+        of top_k * shortlist_factor candidates, which the matching engine then
+        re-scores (section-weighted, from the stored sections) so pool results
+        are comparable with uploaded batches.
+        Returns up to top_k dicts with name, contact and match data, best first.
+        """
+        cleaned_jd = clean_text(jd_text)
+        terms = _jd_terms(cleaned_jd)
+        if not terms:
+            return []
+
+        with self._connect() as conn:
+            query = self._build_query(conn, terms, max_terms, max_df_ratio)
+            if not query:
+                return []
+            rows = conn.execute(
+                "SELECT c.name, c.email, c.phone, c.cleaned_text, c.sections FROM "
+                "(SELECT rowid, rank FROM candidate_fts WHERE candidate_fts MATCH ? "
+                " ORDER BY rank LIMIT ?) AS hits "
+                "JOIN candidates c ON c.id = hits.rowid ORDER BY hits.rank",
+                (query, top_k * shortlist_factor)
+            ).fetchall()
+        if not rows:
+            return []
+
+        shortlist = engine.run_section_match(
+            cleaned_jd, [row[3] for row in rows], [json.loads(row[4]) for row in rows], top_k=top_k
+        )
+        results = []
+        for match in shortlist:
+            name, email, phone, _, _ = rows[match['index']]
+            results.append({"name": name, "contact": {"email": email, "phone": phone}, "match": match})
+        return results
+
+    def _build_query(self, conn, terms, max_terms, max_df_ratio):
+        """
+        OR-query over the JD's most selective terms. Terms present in more than
+        max_df_ratio of the pool add little to bm25 but dominate query cost, so
+        they are dropped. If every term is that common, the rarest few are
+        ANDed instead so the match set stays small.
+        """
+        total = conn.execute("SELECT COUNT(*) FROM candidates").fetchone()[0]
+        doc_freq = dict(conn.execute(
+            f"SELECT term, doc FROM candidate_fts_vocab WHERE term IN ({','.join('?' * len(terms))})",
+            terms
+        ).fetchall())
+        present = sorted((doc_freq[t], t) for t in terms if t in doc_freq)
+        # Posting lists this short are cheap whatever the pool size
+        limit = max(max_df_ratio * total, 5000)
+        selective = [t for df, t in present if df <= limit]
+        if selective:
+            return " OR ".join(f'"{term}"' for term in selective[:max_terms])
+        return " AND ".join(f'"{term}"' for _, term in present[:3])
+
+def _jd_terms(cleaned_jd):
+    """Distinct non-stopword JD terms."""
+    return list(dict.fromkeys(t for t in cleaned_jd.split() if t not in ENGLISH_STOP_WORDS and len(t) > 1))
@@ -0,0 +1,121 @@
+# core/timing.py
+import json
+import sqlite3
+import time
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+
+
+class StageTimer:
+    """
+    Wall and CPU time per pipeline stage, totalled per run and per file.
+    Stages that run in worker processes report their own measurements via
+    add(), so CPU time can exceed wall time when work runs in parallel.
+    """
+
+    def __init__(self):
+        self.totals = {}
+        self.per_file = {}
+        self._wall_start = time.perf_counter()
+        self._cpu_start = time.process_time()
+
+    def add(self, stage, wall, cpu, item=None):
+        total = self.totals.setdefault(stage, [0.0, 0.0, 0])
+        total[0] += wall
+        total[1] += cpu
+        total[2] += 1
+        if item is not None:
+            file_stages = self.per_file.setdefault(item, {})
+            prev_wall, prev_cpu = file_stages.get(stage, (0.0, 0.0))
+            file_stages[stage] = (prev_wall + wall, prev_cpu + cpu)
+
+    @contextmanager
+    def stage(self, name, item=None):
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - wall, time.process_time() - cpu, item)
+
+    def elapsed(self):
+        """(wall, cpu) seconds since the timer was created, in this process."""
+        return time.perf_counter() - self._wall_start, time.process_time() - self._cpu_start
+
+    def to_dict(self):
+        wall, cpu = self.elapsed()
+        return {
+            "wall_s": wall,
+            "cpu_s": cpu,
+            "stages": {s: {"wall_s": w, "cpu_s": c, "calls": n} for s, (w, c, n) in self.totals.items()},
+            "per_file": {str(item): {s: {"wall_s": w, "cpu_s": c} for s, (w, c) in stages.items()}
+                         for item, stages in self.per_file.items()},
+        }
+
+
+def summary_rows(timings):
+    """One row per stage of a StageTimer.to_dict() result, in the order stages were first seen."""
+    return [
+        {"Stage": stage, "Calls": t["calls"], "Wall (s)": round(t["wall_s"], 4), "CPU (s)": round(t["cpu_s"], 4),
+         "Avg Wall (ms)": round(t["wall_s"] * 1000 / t["calls"], 2) if t["calls"] else 0.0}
+        for stage, t in timings["stages"].items()
+    ]
+
+
+def file_rows(timings):
+    """One row per file of a StageTimer.to_dict() result: wall milliseconds for each per-file stage."""
+    per_file = timings["per_file"]
+    stages = list(dict.fromkeys(s for file_stages in per_file.values() for s in file_stages))
+    return [
+        {"File": item, **{f"{s} (ms)": round(file_stages[s]["wall_s"] * 1000, 2) if s in file_stages else None
+                          for s in stages}}
+        for item, file_stages in per_file.items()
+    ]
+
+
+def timed(timer, stage, item=None):
+    """timer.stage(...) when a timer is given, otherwise a no-op context."""
+    return timer.stage(stage, item) if timer is not None else nullcontext()
+
+
+class PerfLog:
+    """Per-run timing records in data/app_db.sqlite, kept for later analysis."""
+
+    def __init__(self, db_path="data/app_db.sqlite"):
+        self.db_path = db_path
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS perf_runs (
+                    id INTEGER PRIMARY KEY,
+                    view TEXT NOT NULL,
+                    n_files INTEGER NOT NULL,
+                    wall_s REAL NOT NULL,
+                    cpu_s REAL NOT NULL,
+                    timings TEXT NOT NULL,
+                    created_at TEXT NOT NULL
+                )
+            """)
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def record(self, timer, view, n_files):
+        data = timer.to_dict()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO perf_runs (view, n_files, wall_s, cpu_s, timings, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (view, n_files, data["wall_s"], data["cpu_s"], json.dumps(data), datetime.now().isoformat())
+            )
+
+    def recent(self, limit=20):
+        """Latest runs, newest first, as dicts with the timings decoded."""
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT view, n_files, wall_s, cpu_s, timings, created_at FROM perf_runs ORDER BY id DESC LIMIT ?",
+                (limit,)
+            ).fetchall()
+        return [
+            {"view": view, "n_files": n, "wall_s": wall, "cpu_s": cpu, "timings": json.loads(timings), "created_at": at}
+            for view, n, wall, cpu, timings, at in rows
+        ]
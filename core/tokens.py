@@ -0,0 +1,206 @@
+# core/tokens.py
+import re
+
+import numpy as np
+from scipy.sparse import csr_matrix
+from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS
+
+from core.skills import TOKEN_RE
+
+# make_vectorizer()'s default token pattern. Neither it nor TOKEN_RE can
+# match across whitespace, which is what lets one split serve every view.
+WORD_RE = re.compile(r"(?u)\b\w\w+\b")
+
+
+class TokenizedDoc:
+    """
+    One document tokenized once for every scorer:
+    - tokens / token_set: its whitespace tokens (Jaccard)
+    - unigrams / bigrams: make_vectorizer()'s analyzer output (TF-IDF)
+    - skill_tokens: core.skills.tokenize() output (skill matching)
+    Each view is identical to what its tokenizer produces from the raw text.
+    Token ids are per vocabulary, so they are assigned by the batch matrix
+    builders below rather than stored here; one doc can serve many fits.
+    """
+
+    __slots__ = ("text", "tokens", "token_set", "unigrams", "bigrams", "skill_tokens")
+
+    def __init__(self, text):
+        self.text = text
+        self.tokens = text.split()
+        self.token_set = set(self.tokens)
+        lowered = text.lower()
+        words = self.tokens if lowered == text else lowered.split()
+        if lowered.isascii() and "".join(words).isalpha():
+            # Cleaned a-z text: every whitespace token is a token for both patterns
+            self.skill_tokens = words
+            self.unigrams = [w for w in words if len(w) > 1 and w not in ENGLISH_STOP_WORDS]
+        else:
+            self.skill_tokens = TOKEN_RE.findall(lowered)
+            self.unigrams = [w for w in WORD_RE.findall(lowered) if w not in ENGLISH_STOP_WORDS]
+        # Bigrams span removed stop words, as sklearn builds them
+        self.bigrams = list(map(" ".join, zip(self.unigrams, self.unigrams[1:])))
+
+    @property
+    def terms(self):
+        """TF-IDF terms: unigrams then bigrams."""
+        return self.unigrams + self.bigrams
+
+
+def as_doc(doc):
+    return doc if isinstance(doc, TokenizedDoc) else TokenizedDoc(doc)
+
+
+def as_docs(documents):
+    """TokenizedDocs for a mix of texts and already tokenized documents."""
+    return [as_doc(doc) for doc in documents]
+
+
+class Vocabulary:
+    """
+    Token -> id map; ids follow first sight. A vocabulary built from `tokens`
+    is fixed: unknown tokens are skipped instead of added.
+    """
+
+    def __init__(self, tokens=None):
+        self.fixed = tokens is not None
+        self.index = {t: i for i, t in enumerate(tokens)} if self.fixed else {}
+
+    def __len__(self):
+        return len(self.index)
+
+    def ids(self, tokens):
+        index = self.index
+        if self.fixed:
+            return np.array([index[t] for t in tokens if t in index], dtype=np.int32)
+        return np.fromiter((index.setdefault(t, len(index)) for t in tokens), dtype=np.int32, count=len(tokens))
+
+    def columns(self):
+        """
+        (names in column order, id -> column). A growing vocabulary is sorted,
+        as CountVectorizer orders its features; a fixed one keeps its order.
+        """
+        names = np.array(list(self.index), dtype=object)
+        if self.fixed:
+            return names, np.arange(len(names), dtype=np.int32)
+        order = np.argsort(names, kind='stable')
+        rank = np.empty(len(order), dtype=np.int32)
+        rank[order] = np.arange(len(order), dtype=np.int32)
+        return names[order], rank
+
+
+_NO_IDS = np.zeros(0, dtype=np.int32)
+
+
+def _count_rows(id_rows, n_columns, dtype):
+    """CSR counts (docs x n_columns) from per-document column-id arrays."""
+    lengths = np.fromiter(map(len, id_rows), dtype=np.int64, count=len(id_rows))
+    cols = np.concatenate(id_rows) if id_rows else np.zeros(0, dtype=np.int32)
+    rows = np.repeat(np.arange(len(id_rows), dtype=np.int32), lengths)
+    # Duplicate (row, col) pairs are summed, giving term frequencies
+    matrix = csr_matrix((np.ones(len(cols), dtype=dtype), (rows, cols)), shape=(len(id_rows), n_columns))
+    matrix.sum_duplicates()
+    return matrix
+
+
+class MatrixBuilder:
+    """
+    TF-IDF and whitespace-token presence rows for a batch, from one
+    tokenization per document. Only compact id arrays are kept per
+    document, so texts can be streamed in and dropped after add().
+    tfidf() matches make_vectorizer().fit_transform and presence()
+    matches make_presence_vectorizer().fit_transform on the same texts.
+    With a fixed `vocabulary`, terms outside it are ignored.
+    """
+
+    def __init__(self, tokens=False, vocabulary=None):
+        self.terms = Vocabulary(vocabulary)
+        self.tokens = Vocabulary() if tokens else None
+        self._term_rows = []
+        self._token_rows = []
+        self._documents = []
+
+    def __len__(self):
+        return len(self._term_rows)
+
+    def add(self, doc, document=True):
+        """
+        Adds one row. Rows added with document=False (e.g. sections of a
+        document already added) are weighted with the documents' IDF but do
+        not count towards it, and get an empty presence row.
+        """
+        doc = as_doc(doc)
+        self._term_rows.append(self.terms.ids(doc.terms))
+        self._documents.append(document)
+        if self.tokens is not None:
+            self._token_rows.append(self.tokens.ids(doc.token_set) if document else _NO_IDS)
+        return doc
+
+    def add_many(self, documents):
+        for doc in documents:
+            self.add(doc)
+        return self
+
+    def counts(self, dtype=np.int32):
+        """Raw term counts. Returns (matrix, feature_names)."""
+        names, rank = self.terms.columns()
+        return _count_rows([rank[ids] for ids in self._term_rows], len(names), dtype), names
+
+    def tfidf(self, dtype=np.float64, chunk_size=None, idf=None):
+        """
+        L2-normalised TF-IDF rows with sklearn's smoothed IDF, or the given
+        idf. A first pass over the id arrays gives every row's size and the
+        document frequencies; rows are then counted, weighted and normalised
+        chunk_size at a time straight into the preallocated result, so only
+        one chunk of counts exists beside it. Returns
+        (matrix, feature_names, idf).
+        """
+        names, rank = self.terms.columns()
+        rows = self._term_rows
+        n_rows, n_columns = len(rows), len(names)
+
+        # 1. Distinct ids per row: row sizes and, for documents, their df
+        row_nnz = np.zeros(n_rows, dtype=np.int64)
+        id_freq = np.zeros(len(rank), dtype=np.int64)
+        for r, (ids, document) in enumerate(zip(rows, self._documents)):
+            distinct = np.unique(ids)
+            row_nnz[r] = len(distinct)
+            if document:
+                id_freq[distinct] += 1
+        if idf is None:
+            doc_freq = np.zeros(n_columns, dtype=np.int64)
+            doc_freq[rank] = id_freq
+            idf = smoothed_idf(doc_freq, sum(self._documents))
+
+        indptr = np.zeros(n_rows + 1, dtype=np.int64)
+        np.cumsum(row_nnz, out=indptr[1:])
+        index_dtype = np.int64 if max(indptr[-1], n_columns) >= 2 ** 31 else np.int32
+        indptr = indptr.astype(index_dtype)
+        data = np.empty(indptr[-1], dtype=dtype)
+        indices = np.empty(indptr[-1], dtype=index_dtype)
+
+        # 2. Counts -> TF-IDF -> unit rows, one chunk at a time
+        weights = np.asarray(idf, dtype=np.float64)
+        step = chunk_size or max(n_rows, 1)
+        for start in range(0, n_rows, step):
+            end = min(start + step, n_rows)
+            block = _count_rows([rank[ids] for ids in rows[start:end]], n_columns, np.int32)
+            sizes = np.diff(block.indptr)
+            values = block.data * weights[block.indices]
+            norms = np.sqrt(np.bincount(np.repeat(np.arange(end - start), sizes),
+                                        weights=values ** 2, minlength=end - start))
+            norms[norms == 0] = 1.0
+            values /= np.repeat(norms, sizes)
+            data[indptr[start]:indptr[end]] = values
+            indices[indptr[start]:indptr[end]] = block.indices
+        return csr_matrix((data, indices, indptr), shape=(n_rows, n_columns)), names, idf
+
+    def presence(self, dtype=np.int32):
+        """Binary token presence. Returns (matrix, tokens)."""
+        names, rank = self.tokens.columns()
+        return _count_rows([rank[ids] for ids in self._token_rows], len(names), dtype), names
+
+
+def smoothed_idf(doc_freq, n_docs):
+    """sklearn's smooth_idf formula over a document-frequency array."""
+    return np.log((1 + n_docs) / (1 + np.asarray(doc_freq, dtype=np.float64))) + 1
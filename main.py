@@ -1,71 +1,218 @@
+import argparse
+import csv
+import json
 import os
-from src.pdf_reader import extract_text_from_pdf
-from src.text_cleaner import clean_text
-from src.matcher import calculate_match
-from src.skills import extract_skills  # <--- NEW IMPORT
-
-def main():
-    # --- SETUP PATHS ---
-    base_dir = os.path.dirname(os.path.abspath(__file__))
-    resumes_dir = os.path.join(base_dir, 'data', 'resumes')
-    jd_path = os.path.join(base_dir, 'data', 'job_description.txt')
-
-    # --- 1. READ JOB DESCRIPTION ---
-    if not os.path.exists(jd_path):
-        print("❌ Error: data/job_description.txt not found.")
-        return
-
-    with open(jd_path, 'r', encoding='utf-8') as f:
-        raw_jd = f.read()
-
-    # --- 2. READ RESUMES ---
-    resume_files = [f for f in os.listdir(resumes_dir) if f.endswith('.pdf')]
-    resume_texts = []
-    valid_filenames = []
-
-    for filename in resume_files:
-        path = os.path.join(resumes_dir, filename)
-        text = extract_text_from_pdf(path)
-        if text.strip():
-            resume_texts.append(clean_text(text))
-            valid_filenames.append(filename)
-
-    # --- 3. RUN MATCHING ---
-    cleaned_jd = clean_text(raw_jd)
-    scores = calculate_match(cleaned_jd, resume_texts)
-    
-    # --- 4. EXTRACT SKILLS (NEW) ---
-    jd_skills = extract_skills(cleaned_jd)
-    print(f"\n🔍 Job Requires: {', '.join(jd_skills).upper()}")
-
-    # --- 5. DISPLAY RESULTS ---
-    final_results = []
-    for i, filename in enumerate(valid_filenames):
-        # Find skills in this specific resume
-        resume_skills = extract_skills(resume_texts[i])
-        # Calculate how many JD skills the candidate has
-        skills_matched = set(resume_skills).intersection(set(jd_skills))
-        
-        final_results.append({
-            "name": filename,
-            "score": scores[i]['total'],
-            "skills_found": resume_skills,
-            "skills_matched": skills_matched
-        })
-
-    final_results.sort(key=lambda x: x['score'], reverse=True)
-
-    print("\n" + "="*50)
-    print(" 🏆 RESUME MATCHING REPORT (WITH SKILLS)")
-    print("="*50)
-    
-    for item in final_results:
-        print(f"📄 {item['name']}")
-        print(f"   ✅ Match Score: {item['score']}%")
-        # Show skills
-        matched_str = ", ".join(item['skills_matched']).upper() if item['skills_matched'] else "None"
-        print(f"   🎯 Skills Matched: {matched_str}")
-        print("-" * 30)
+import sys
+import tempfile
+
+from core.config import get_config, save_config
+from core.corpus_index import CorpusIndex
+from core.engine import MatchingEngine
+from core.parse_cache import ParseCache
+from core.parser import PARSER_VERSION, ResumeParser
+from core.skills import get_skill_matcher
+from core.tokens import as_doc
+from utils.text_utils import clean_sections, get_normalizer
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+OUTPUT_FIELDS = [
+    "jd", "rank", "candidate", "file", "score", "raw_cosine",
+    "email", "phone", "keywords", "skills_matched"
+]
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Headless batch matching: rank a directory of resumes against one or more job descriptions."
+    )
+    parser.add_argument(
+        "jd_files", nargs="*",
+        default=[os.path.join(BASE_DIR, 'data', 'job_description.txt')],
+        help="Job description text files (default: data/job_description.txt)"
+    )
+    parser.add_argument("--resumes", default=os.path.join(BASE_DIR, 'data', 'resumes'),
+                        help="Directory of PDF resumes, searched recursively (default: data/resumes)")
+    parser.add_argument("--format", choices=["jsonl", "csv"], default="jsonl", help="Output format")
+    parser.add_argument("-o", "--output", default="-", help="Output file (default: stdout)")
+    parser.add_argument("--top-k", type=int, default=None, help="Keep only the best K candidates per JD")
+    parser.add_argument("--min-score", type=float, default=None, help="Drop candidates scoring below this")
+    parser.add_argument("--workers", type=int, default=None, help="Parser processes (default: all CPUs)")
+    parser.add_argument("--timeout", type=float, default=30, help="Per-resume parse timeout in seconds")
+    parser.add_argument("--index-dir", default=None,
+                        help="Keep the vectorized corpus here; a later run over the same resumes reuses it "
+                             "instead of re-vectorizing (default: a temporary directory)")
+    parser.add_argument("--config", default=os.path.join(BASE_DIR, 'data', 'config.yaml'))
+    parser.add_argument("--db", default=os.path.join(BASE_DIR, 'data', 'app_db.sqlite'),
+                        help="SQLite database holding the parse cache")
+    parser.add_argument("--fit-section-scales", action="store_true",
+                        help="Instead of ranking, fit the section_scales used by section-weighted "
+                             "scoring on these JDs and resumes and save them to --config")
+    return parser.parse_args(argv)
+
+
+def find_resumes(directory):
+    """Every PDF under directory, in a stable order."""
+    found = []
+    for root, _, files in os.walk(directory):
+        found.extend(os.path.join(root, f) for f in files if f.lower().endswith('.pdf'))
+    return sorted(found)
+
+
+def index_params(parser, normalizer):
+    """What the stored vectors depend on besides the PDFs themselves."""
+    return {
+        "normalizer": normalizer.signature,
+        "parser_version": PARSER_VERSION,
+        "max_pages": parser.max_pages,
+        "max_chars": parser.max_chars,
+    }
+
+
+def open_index(engine, directory, texts, doc_ids, params):
+    """
+    The corpus index in directory if it holds exactly these documents,
+    extracted and cleaned with the same params; otherwise a fresh one built there.
+    """
+    try:
+        index = CorpusIndex.open(directory)
+    except (OSError, ValueError):
+        index = None
+    stored = index.manifest.get("params", {}) if index is not None else {}
+    if (index is not None and len(index) == len(doc_ids)
+            and all(stored.get(key) == value for key, value in params.items())
+            and all(index.doc_ids[i] == doc_id for i, doc_id in enumerate(doc_ids))):
+        log(f"Reusing the corpus index in {directory}")
+        return index
+    log(f"Vectorizing {len(doc_ids)} resumes...")
+    return engine.build_corpus_index(texts, doc_ids, directory, params=params)
+
+
+def fit_section_scales(engine, config_path, jds, records):
+    """Fits config.section_scales on the given JDs and parsed resumes and saves them."""
+    sections = tuple(s for s in engine.config.section_weights if s != "full_text")
+    scales = engine.fit_section_scales(
+        jds, [record['cleaned'] for record in records],
+        [clean_sections(record['segments'], sections) for record in records], sections
+    )
+    if not scales:
+        log("❌ Error: none of the resumes has a section to calibrate.")
+        return 1
+    config = get_config(config_path).as_dict()
+    config['section_scales'] = dict(config.get('section_scales') or {}, **scales)
+    save_config(config, config_path)
+    log(f"Saved section_scales to {config_path}: {scales}")
+    return 0
+
+
+def log(message):
+    print(message, file=sys.stderr, flush=True)
+
+
+class RowWriter:
+    """Writes result rows as JSONL or CSV, flushing each one so consumers see it immediately."""
+
+    def __init__(self, stream, fmt):
+        self.stream = stream
+        self.fmt = fmt
+        if fmt == "csv":
+            self._csv = csv.DictWriter(stream, fieldnames=OUTPUT_FIELDS)
+            self._csv.writeheader()
+
+    def write(self, row):
+        if self.fmt == "csv":
+            self._csv.writerow({k: ", ".join(v) if isinstance(v, list) else v for k, v in row.items()})
+        else:
+            self.stream.write(json.dumps(row) + "\n")
+        self.stream.flush()
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    # --- 1. READ JOB DESCRIPTIONS ---
+    config = get_config(args.config)
+    normalizer = get_normalizer(args.config)
+    jds = []
+    for jd_path in args.jd_files:
+        if not os.path.exists(jd_path):
+            log(f"❌ Error: {jd_path} not found.")
+            return 1
+        with open(jd_path, 'r', encoding='utf-8') as f:
+            jds.append((os.path.basename(jd_path), normalizer.clean(f.read())))
+
+    # --- 2. PARSE RESUMES (parallel, cache-aware) ---
+    paths = find_resumes(args.resumes)
+    if not paths:
+        log(f"❌ Error: no PDF resumes found in {args.resumes}.")
+        return 1
+
+    parser = ResumeParser()
+    parsed = []
+    for done, (i, record, error) in enumerate(
+        ParseCache(args.db, normalizer=normalizer, contact_window=config.contact_window).parse_many(
+            parser, paths, max_workers=args.workers, timeout=args.timeout,
+            chunk_size=config.ingest_chunk_size
+        ), 1
+    ):
+        if error:
+            log(f"⚠️ {paths[i]}: {error}")
+        elif record['cleaned'].strip():
+            parsed.append((paths[i], record))
+        if done % 100 == 0 or done == len(paths):
+            log(f"Parsed {done}/{len(paths)}")
+    if not parsed:
+        log("❌ Error: no resume could be parsed.")
+        return 1
+    # Completion order varies run to run; doc order must not
+    parsed.sort(key=lambda item: item[0])
+
+    engine = MatchingEngine(config_path=args.config)
+    if args.fit_section_scales:
+        return fit_section_scales(engine, args.config, [jd for _, jd in jds], [record for _, record in parsed])
+
+    # --- 3. ONE FIT FOR THE WHOLE CORPUS ---
+    matcher = get_skill_matcher(args.config)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        index_dir = args.index_dir or os.path.join(tmp_dir, "corpus_index")
+        index = open_index(
+            engine, index_dir,
+            (record['cleaned'] for _, record in parsed),
+            [record['content_hash'] for _, record in parsed],
+            index_params(parser, normalizer)
+        )
+        resume_skills = {}
+
+        # --- 4. RANK EACH JD, STREAMING ITS ROWS ---
+        out = sys.stdout if args.output == "-" else open(args.output, 'w', encoding='utf-8', newline='')
+        try:
+            writer = RowWriter(out, args.format)
+            for jd_name, cleaned_jd in jds:
+                jd_doc = as_doc(cleaned_jd)
+                jd_skills = set(matcher.find_tokens(jd_doc.skill_tokens))
+                matches = engine.run_index_match(jd_doc, index, top_k=args.top_k, min_score=args.min_score)
+                for rank, match in enumerate(matches, 1):
+                    path, record = parsed[match['index']]
+                    if path not in resume_skills:
+                        resume_skills[path] = matcher.find(record['cleaned'])
+                    writer.write({
+                        "jd": jd_name,
+                        "rank": rank,
+                        "candidate": os.path.splitext(os.path.basename(path))[0],
+                        "file": path,
+                        "score": match['score'],
+                        "raw_cosine": round(match['raw_cosine'], 4),
+                        "email": record['contact'].get('email'),
+                        "phone": record['contact'].get('phone'),
+                        "keywords": match['keywords'],
+                        "skills_matched": [s for s in resume_skills[path] if s in jd_skills],
+                    })
+                log(f"Ranked {len(matches)} candidates for {jd_name}")
+        finally:
+            if out is not sys.stdout:
+                out.close()
+    return 0
+
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
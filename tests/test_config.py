@@ -0,0 +1,63 @@
+import os
+
+import yaml
+
+from core.config import get_config, save_config
+
+
+def _write(path, data):
+    with open(path, 'w') as f:
+        yaml.dump(data, f)
+
+
+def test_config_is_cached_until_the_file_changes(tmp_path):
+    path = str(tmp_path / "config.yaml")
+    _write(path, {"config_version": 1, "scoring_weights": {"cosine": 0.7, "jaccard": 0.3}})
+
+    first = get_config(path)
+    assert get_config(path) is first
+    assert first.cosine_weight == 0.7
+
+    _write(path, {"config_version": 2, "scoring_weights": {"cosine": 0.5, "jaccard": 0.5}, "extra": "x" * 10})
+    # Same mtime on coarse filesystems is still caught through the size
+    reloaded = get_config(path)
+
+    assert reloaded is not first
+    assert reloaded.version == 2 and reloaded.cosine_weight == 0.5
+
+
+def test_save_config_bumps_version_and_replaces_atomically(tmp_path):
+    path = str(tmp_path / "config.yaml")
+    _write(path, {"config_version": 3, "taxonomy": {"languages": ["python", "c++"]}})
+    data = get_config(path).as_dict()
+    data["taxonomy"]["languages"].append("rust")
+
+    saved = save_config(data, path)
+
+    assert saved.version == 4
+    assert get_config(path) is saved
+    assert saved.taxonomy["languages"] == ("python", "c++", "rust")
+    assert "c++" in saved.normalizer.protected
+    with open(path) as f:
+        assert yaml.safe_load(f)["config_version"] == 4
+    assert os.listdir(tmp_path) == ["config.yaml"]
+
+
+def test_save_config_never_goes_back_a_version(tmp_path):
+    path = str(tmp_path / "config.yaml")
+    _write(path, {"config_version": 5})
+    get_config(path)
+
+    # A stale dict from an editor opened before the last save
+    assert save_config({"config_version": 2}, path).version == 6
+
+
+def test_as_dict_is_a_copy(tmp_path):
+    path = str(tmp_path / "config.yaml")
+    _write(path, {"config_version": 1, "section_weights": {"full_text": 1.0}})
+    config = get_config(path)
+
+    config.as_dict()["section_weights"]["full_text"] = 0.0
+
+    assert config.section_weights["full_text"] == 1.0
+    assert get_config(path).as_dict()["section_weights"] == {"full_text": 1.0}
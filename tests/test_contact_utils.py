@@ -0,0 +1,39 @@
+from utils.contact_utils import NOT_FOUND, extract_contact_info
+
+HEADER = "Jane Doe | jane.doe@example.com | +1 555-123-4567\n"
+
+
+def test_finds_first_email_and_phone():
+    text = HEADER + "Backup: other@example.org 555 987 6543\n"
+
+    assert extract_contact_info(text) == {"email": "jane.doe@example.com", "phone": "+1 555-123-4567"}
+
+
+def test_ignores_contacts_past_the_window():
+    text = "x" * 100 + "\n" + HEADER
+
+    assert extract_contact_info(text, window=50) == {"email": NOT_FOUND, "phone": NOT_FOUND}
+    assert extract_contact_info(text, window=0)["email"] == "jane.doe@example.com"
+
+
+def test_window_extends_to_the_end_of_the_line():
+    # The window ends inside the email; the search runs on to the line break
+    text = "Contact: " + HEADER + "more text\n"
+
+    assert extract_contact_info(text, window=15) == {"email": "jane.doe@example.com", "phone": "+1 555-123-4567"}
+
+
+def test_window_stops_when_no_line_break_is_near():
+    text = "a" * 20 + "jane@example.com" + "b" * 1000
+
+    assert extract_contact_info(text, window=25)["email"] == NOT_FOUND
+
+
+def test_email_search_starts_at_the_local_part():
+    text = "Skills: python, sql\nmail: first.last-name_1@mail.example.co.uk\n"
+
+    assert extract_contact_info(text)["email"] == "first.last-name_1@mail.example.co.uk"
+
+
+def test_not_found_on_empty_text():
+    assert extract_contact_info("") == {"email": NOT_FOUND, "phone": NOT_FOUND}
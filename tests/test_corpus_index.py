@@ -0,0 +1,102 @@
+import json
+import os
+
+import pytest
+
+np = pytest.importorskip("numpy")
+sparse = pytest.importorskip("scipy.sparse")
+pytest.importorskip("sklearn")
+
+from core.corpus_index import CorpusIndex  # noqa: E402
+from core.engine import MatchingEngine  # noqa: E402
+
+CONFIG = os.path.join(os.path.dirname(__file__), "..", "data", "config.yaml")
+
+RESUMES = [
+    "python django aws developer",
+    "java spring kubernetes engineer",
+    "python pandas numpy data scientist",
+]
+
+
+def _write(directory, n_docs=2):
+    tfidf = sparse.csr_matrix(np.eye(n_docs, 3, dtype=np.float64))
+    presence = sparse.csr_matrix(np.eye(n_docs, 4, dtype=np.int32))
+    CorpusIndex.write(
+        directory, tfidf, np.ones(3), ["a", "b", "c"], presence, ["w", "x", "y", "z"],
+        [f"doc{i}" for i in range(n_docs)], params={"k": "v"}
+    )
+
+
+def _mapped(array):
+    """Whether array is backed by a file mapping (scipy may hold a plain-ndarray view of it)."""
+    while array is not None:
+        if isinstance(array, np.memmap):
+            return True
+        array = array.base if isinstance(array, np.ndarray) else None
+    return False
+
+
+def _versions(directory):
+    return sorted(name for name in os.listdir(directory) if name.startswith("v-"))
+
+
+def test_open_maps_read_only_arrays(tmp_path):
+    directory = str(tmp_path / "index")
+    _write(directory)
+
+    index = CorpusIndex.open(directory)
+
+    assert len(index) == 2
+    assert list(index.doc_ids[i] for i in range(len(index))) == ["doc0", "doc1"]
+    assert index.manifest["params"] == {"k": "v"}
+    assert index.tfidf.dtype == np.float32
+    for array in (index.tfidf.data, index.tfidf.indices, index.presence.indices, index.idf):
+        assert _mapped(array)
+        assert not array.flags.writeable
+    assert index.term_columns(["b", "missing"]) == {"b": 1}
+
+
+def test_write_swaps_pointer_and_prunes_old_versions(tmp_path):
+    directory = str(tmp_path / "index")
+    _write(directory, n_docs=1)
+    first = _versions(directory)
+    _write(directory, n_docs=2)
+    second = _versions(directory)
+    _write(directory, n_docs=3)
+    third = _versions(directory)
+
+    assert len(first) == 1
+    # The previous version is kept for readers that just read the old pointer
+    assert len(second) == 2 and first[0] in second
+    assert len(third) == 2 and first[0] not in third
+    with open(os.path.join(directory, "CURRENT"), encoding="utf-8") as f:
+        assert f.read().strip() == third[-1]
+    assert len(CorpusIndex.open(directory)) == 3
+
+
+def test_format_mismatch_raises(tmp_path):
+    directory = str(tmp_path / "index")
+    _write(directory)
+    with open(os.path.join(directory, "CURRENT"), encoding="utf-8") as f:
+        manifest_path = os.path.join(directory, f.read().strip(), "manifest.json")
+    with open(manifest_path, encoding="utf-8") as f:
+        manifest = json.load(f)
+    manifest["version"] = -1
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f)
+
+    with pytest.raises(ValueError):
+        CorpusIndex.open(directory)
+
+
+def test_index_match_keeps_mapped_dtype(tmp_path):
+    engine = MatchingEngine(config_path=CONFIG, db_path=str(tmp_path / "app.sqlite"))
+    index = engine.build_corpus_index(RESUMES, ["a", "b", "c"], str(tmp_path / "index"))
+
+    results = engine.run_index_match("python developer", index)
+
+    assert [r["doc_id"] for r in results][0] == "a"
+    assert [r["score"] for r in results] == sorted((r["score"] for r in results), reverse=True)
+    # Still mapped: nothing upcast the stored matrix
+    assert index.tfidf.dtype == np.float32 and _mapped(index.tfidf.data)
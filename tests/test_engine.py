@@ -0,0 +1,41 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("sklearn")
+
+from core.engine import select_top_k  # noqa: E402
+
+SCORES = np.array([5.0, 7.0, 7.0, 1.0, 7.0, 7.0, 3.0, 7.0, 7.0])
+
+
+def test_all_scores_best_first_ties_by_position():
+    assert select_top_k(SCORES).tolist() == [1, 2, 4, 5, 7, 8, 0, 6, 3]
+
+
+@pytest.mark.parametrize("k", [0, -1])
+def test_non_positive_k_selects_nothing(k):
+    selected = select_top_k(SCORES, k)
+    assert selected.tolist() == [] and selected.dtype == np.int64
+
+
+def test_k_beyond_length_returns_everything():
+    assert select_top_k(SCORES, 20).tolist() == select_top_k(SCORES).tolist()
+    assert select_top_k(np.zeros(0), 3).tolist() == []
+
+
+@pytest.mark.parametrize("k", range(1, len(SCORES) + 1))
+def test_top_k_is_a_prefix_of_the_full_ranking(k):
+    assert select_top_k(SCORES, k).tolist() == select_top_k(SCORES)[:k].tolist()
+
+
+def test_prefix_holds_on_many_ties():
+    scores = np.random.default_rng(0).integers(0, 3, 500).astype(float)
+    full = select_top_k(scores)
+    for k in (1, 5, 50, 499):
+        assert select_top_k(scores, k).tolist() == full[:k].tolist()
+
+
+def test_min_score_filters_before_k():
+    assert select_top_k(SCORES, 3, min_score=5.0).tolist() == [1, 2, 4]
+    assert select_top_k(SCORES, 3, min_score=8.0).tolist() == []
+    assert select_top_k(SCORES, None, min_score=3.0).tolist() == [1, 2, 4, 5, 7, 8, 0, 6]
@@ -0,0 +1,36 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("scipy")
+pytest.importorskip("sklearn")
+
+from core.engine import make_vectorizer  # noqa: E402
+from core.idf_model import IDFModel  # noqa: E402
+
+DOCS = ["python django aws developer", "java spring developer", "python pandas data scientist"]
+
+
+def test_update_counts_each_document_once(tmp_path):
+    db_path = str(tmp_path / "app.sqlite")
+    model = IDFModel(db_path)
+
+    assert model.update(DOCS) == 3
+    # Another process's instance sees the same counts and skips known documents
+    other = IDFModel(db_path)
+    assert other.update(DOCS[:1] + ["go rust developer"]) == 1
+
+    n_docs, doc_freq = model.stats(["python", "developer", "rust", "unknown"])
+    assert n_docs == 4
+    assert doc_freq == {"python": 2, "developer": 3, "rust": 1}
+
+
+def test_transform_matches_vectorizer_idf(tmp_path):
+    model = IDFModel(str(tmp_path / "app.sqlite"))
+    model.update(DOCS)
+    vectorizer = make_vectorizer().fit(DOCS)
+
+    matrix, names = model.transform(DOCS)
+
+    expected = vectorizer.transform(DOCS)
+    columns = [list(vectorizer.get_feature_names_out()).index(name) for name in names]
+    np.testing.assert_allclose(matrix.toarray(), expected.toarray()[:, columns], atol=1e-12)
@@ -0,0 +1,114 @@
+import os
+
+import pytest
+
+pytest.importorskip("numpy")
+pytest.importorskip("sklearn")
+pytest.importorskip("pypdf")
+
+from benchmarks.synthetic import SyntheticCorpus, text_to_pdf  # noqa: E402
+from core.config import get_config, save_config  # noqa: E402
+from core.jobs import FIRST_RESCORE, JobQueue  # noqa: E402
+
+CONFIG = os.path.join(os.path.dirname(__file__), "..", "data", "config.yaml")
+N_FILES = FIRST_RESCORE + 2
+
+
+class Upload:
+    """Stands in for a Streamlit UploadedFile."""
+
+    def __init__(self, name, data):
+        self.name = name
+        self.size = len(data)
+        self._data = data
+
+    def getvalue(self):
+        return self._data
+
+
+def _uploads(seed=0):
+    corpus = SyntheticCorpus(seed, config_path=CONFIG)
+    return [Upload(f"resume_{i}.pdf", text_to_pdf(corpus.resume(i))) for i in range(N_FILES)]
+
+
+def _queue(tmp_path, config_path=CONFIG):
+    """A queue whose jobs are run by the test itself, on this thread."""
+    queue = JobQueue(db_path=str(tmp_path / "app.sqlite"), config_path=config_path)
+    queue.pending = []
+    queue._executor.submit = lambda fn, job: queue.pending.append(job)
+    saves = []
+    save = queue.store.save
+    queue.store.save = lambda snapshot: (saves.append(snapshot), save(snapshot))
+    return queue, saves
+
+
+def test_job_publishes_provisional_then_final_ranking(tmp_path):
+    queue, saves = _queue(tmp_path)
+    job_id = queue.submit(SyntheticCorpus(0, config_path=CONFIG).jd(0), _uploads())
+
+    queue._run(queue.pending.pop())
+
+    provisional = [s for s in saves if s["status"] == "running" and s["results"]]
+    assert provisional and all(s["provisional"] for s in provisional)
+    assert len(provisional[0]["results"]) == FIRST_RESCORE
+
+    final = queue.get(job_id)
+    assert final["status"] == "done" and not final["provisional"]
+    assert final["done"] == final["parsed"] == N_FILES and not final["errors"]
+    scores = [r["match"]["score"] for r in final["results"]]
+    assert len(scores) == N_FILES and scores == sorted(scores, reverse=True)
+
+
+def test_cancel_before_start(tmp_path):
+    queue, _ = _queue(tmp_path)
+    job_id = queue.submit("python developer", _uploads())
+    queue.cancel(job_id)
+
+    queue._run(queue.pending.pop())
+
+    snapshot = queue.get(job_id)
+    assert snapshot["status"] == "cancelled" and snapshot["done"] == 0 and snapshot["results"] == []
+
+
+def test_cancel_mid_batch_keeps_parsed_results(tmp_path):
+    queue, _ = _queue(tmp_path)
+    job_id = queue.submit("python developer", _uploads(seed=1))
+    job = queue.pending.pop()
+    parse_many = queue.parse_cache.parse_many
+
+    def cancel_after_first(*args, **kwargs):
+        stream = parse_many(*args, **kwargs)
+        first = next(stream)
+        job.cancel()
+        yield first
+        yield from stream
+
+    queue.parse_cache.parse_many = cancel_after_first
+    queue._run(job)
+
+    snapshot = queue.get(job_id)
+    assert snapshot["status"] == "cancelled" and not snapshot["provisional"]
+    assert snapshot["done"] == 1 and len(snapshot["results"]) == 1
+
+
+def test_uploads_past_the_byte_budget_are_spooled(tmp_path):
+    uploads = _uploads()
+    data = get_config(CONFIG).as_dict()
+    # Room for about two of the uploads in memory
+    data.setdefault("ingestion", {})["spool_threshold_mb"] = (uploads[0].size * 2.5) / (1024 * 1024)
+    config_path = str(tmp_path / "config.yaml")
+    save_config(data, config_path)
+    queue, _ = _queue(tmp_path, config_path)
+
+    job_id = queue.submit("python developer", uploads)
+    job = queue.pending.pop()
+
+    held = [p for p in job.payloads if isinstance(p, bytes)]
+    assert 1 <= len(held) < N_FILES
+    assert sum(map(len, held)) <= queue.engine.config.spool_threshold
+    assert all(os.path.dirname(p) == job.spool_dir for p in job.payloads if not isinstance(p, bytes))
+
+    queue._run(job)
+
+    assert not os.path.exists(job.spool_dir)
+    assert queue.get(job_id)["parsed"] == N_FILES
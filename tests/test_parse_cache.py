@@ -0,0 +1,95 @@
+import pytest
+
+pytest.importorskip("pypdf")
+
+from core.parse_cache import ParseCache, ParseLRU, _record_size, build_record, parse_params  # noqa: E402
+from core.parser import ResumeParser  # noqa: E402
+from utils.text_utils import TextNormalizer  # noqa: E402
+
+TEXT = "Jane Doe\nSenior C++ developer, Berlin\njane.doe@example.com\n+1 555 123 4567\n"
+SEGMENTS = {"full_text": TEXT, "offsets": {"experience": [], "education": [], "skills": [], "projects": []}}
+
+
+def _cache(tmp_path, normalizer=None, contact_window=5000):
+    return ParseCache(str(tmp_path / "app.sqlite"), memory=ParseLRU(),
+                      normalizer=normalizer or TextNormalizer(), contact_window=contact_window)
+
+
+def _store(cache, digest="abc", parser=None):
+    record = build_record(SEGMENTS, normalizer=cache.normalizer, contact_window=cache.contact_window)
+    cache.put(digest, dict(record, parse_params=parse_params(parser or ResumeParser())))
+    return record
+
+
+def test_hit_needs_the_same_extraction_caps(tmp_path):
+    cache = _cache(tmp_path)
+    record = _store(cache)
+
+    assert cache.get("abc")["cleaned"] == record["cleaned"]
+    assert cache.get("abc", ResumeParser(max_pages=1)) is None
+    # Same miss once the record has to come from SQLite
+    assert _cache(tmp_path).get("abc", ResumeParser(max_chars=100)) is None
+    assert _cache(tmp_path).get("abc")["contact"]["email"] == "jane.doe@example.com"
+
+
+def test_other_contact_window_re_extracts_contact(tmp_path):
+    _store(_cache(tmp_path))
+
+    narrow = _cache(tmp_path, contact_window=10)
+    record = narrow.get("abc")
+
+    assert record["contact"] == {"email": "Not found", "phone": "Not found"}
+    assert record["contact_window"] == 10
+    # Written back: a later lookup with that window is served as stored
+    assert _cache(tmp_path, contact_window=10).get("abc")["contact"]["email"] == "Not found"
+
+
+def test_other_normalizer_re_cleans(tmp_path):
+    _store(_cache(tmp_path))
+    assert "c++" not in _cache(tmp_path).get("abc")["cleaned"].split()
+
+    protecting = TextNormalizer(("c++",))
+    record = _cache(tmp_path, normalizer=protecting).get("abc")
+
+    assert "c++" in record["cleaned"].split()
+    assert record["normalizer"] == protecting.signature
+
+
+def _record(chars):
+    return {"segments": {"full_text": "x" * chars, "offsets": {}}, "cleaned": ""}
+
+
+def test_lru_evicts_least_recently_used_by_size():
+    size = _record_size(_record(100))
+    lru = ParseLRU(max_bytes=3 * size)
+    for digest in "abc":
+        lru.put(digest, _record(100))
+
+    lru.get_many(["a"])
+    lru.put("d", _record(100))
+
+    assert sorted(lru.get_many("abcd")) == ["a", "c", "d"]
+    assert lru.size == 3 * size
+
+
+def test_lru_large_record_evicts_several():
+    small = _record_size(_record(100))
+    lru = ParseLRU(max_bytes=3 * small)
+    for digest in "abc":
+        lru.put(digest, _record(100))
+
+    lru.put("big", _record(250))
+
+    assert sorted(lru.get_many(["a", "b", "c", "big"])) == ["big", "c"]
+    assert lru.size <= lru.max_bytes
+
+
+def test_lru_skips_records_over_budget_and_replaces_in_place():
+    lru = ParseLRU(max_bytes=_record_size(_record(100)))
+    lru.put("huge", _record(1000))
+    assert len(lru) == 0
+
+    lru.put("a", _record(10))
+    lru.put("a", _record(50))
+
+    assert len(lru) == 1 and lru.size == _record_size(_record(50))
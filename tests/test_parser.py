@@ -0,0 +1,115 @@
+import io
+import os
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("pypdf")
+
+import core.parser as parser_module  # noqa: E402
+from benchmarks.synthetic import text_to_pdf  # noqa: E402
+from core.parser import SECTION_HEADER_RE, ResumeParser, _can_enforce, _parse_payload  # noqa: E402
+from utils.text_utils import section_text  # noqa: E402
+
+RESUME = "\n".join([
+    "Jane Doe",
+    "Summary",
+    "Backend developer with experience with tools and technologies",
+    "Work Experience",
+    "Developer at Acme",
+    "Education:",
+    "BSc Computer Science",
+    "Technical Skills & Expertise",
+    "python, sql",
+    "Experience",
+    "Lead at Globex",
+])
+
+
+def _slow_parse(self, pdf_file):
+    time.sleep(2)
+
+
+def _crashing_parse(payload, timeout, max_pages, max_chars):
+    # Module-level so worker processes can unpickle it
+    if payload == b"crash":
+        os._exit(1)
+    return {"full_text": payload.decode(), "offsets": {}}, None, 0.0, 0.0
+
+
+@pytest.mark.parametrize("line, section", [
+    ("Work Experience", "experience"),
+    ("EDUCATION:", "education"),
+    ("2. Projects and Achievements", "projects"),
+    ("Technical Skills & Expertise", "skills"),
+    ("Skills / Tools", "skills"),
+    ("Professional Background \u2014", "experience"),
+    ("experience with tools", None),
+    ("tools and technologies used daily", None),
+])
+def test_header_lines(line, section):
+    match = SECTION_HEADER_RE.match(line)
+    assert (match.lastgroup if match else None) == section
+
+
+def test_segment_offsets_cover_repeated_sections():
+    segments = {"full_text": RESUME, "offsets": ResumeParser().segment_offsets(RESUME)}
+
+    assert section_text(segments, "experience") == (
+        "Work Experience\nDeveloper at Acme\n Experience\nLead at Globex"
+    )
+    assert section_text(segments, "education") == "Education:\nBSc Computer Science\n"
+    assert section_text(segments, "skills") == "Technical Skills & Expertise\npython, sql\n"
+    assert segments["offsets"]["projects"] == []
+
+
+def test_long_lines_are_never_headers():
+    text = "Skills\n" + "Experience" + " " * 80 + "\npython"
+    assert ResumeParser().segment_offsets(text)["experience"] == []
+
+
+def test_streamed_parse_matches_one_pass_segmentation():
+    # Several pages, so section bodies span page breaks
+    result = ResumeParser().parse(io.BytesIO(text_to_pdf(RESUME, lines_per_page=3)))
+
+    assert "Lead at Globex" in result["full_text"]
+    assert result["offsets"] == ResumeParser().segment_offsets(result["full_text"])
+
+
+def test_page_cap_stops_extraction():
+    result = ResumeParser(max_pages=1).parse(io.BytesIO(text_to_pdf(RESUME, lines_per_page=3)))
+
+    assert "Jane Doe" in result["full_text"] and "Developer at Acme" not in result["full_text"]
+
+
+def test_parse_times_out_at_fractional_timeout(monkeypatch):
+    monkeypatch.setattr(ResumeParser, "parse", _slow_parse)
+
+    start = time.perf_counter()
+    segments, error = _parse_payload(b"%PDF", 0.2)
+
+    assert segments is None and error == "Timed out after 0.2s"
+    assert time.perf_counter() - start < 1
+
+
+def test_timeout_only_enforceable_in_main_thread():
+    seen = []
+    thread = threading.Thread(target=lambda: seen.append((_can_enforce(5), _can_enforce(0))))
+    thread.start()
+    thread.join()
+
+    assert _can_enforce(5)
+    assert seen == [(False, True)]
+
+
+def test_crash_only_fails_its_own_file(monkeypatch):
+    monkeypatch.setattr(parser_module, "_timed_parse_payload", _crashing_parse)
+    files = [b"first", b"crash", b"second", b"third"]
+
+    results = {i: (segments, error) for i, segments, error in ResumeParser().parse_many(files, max_workers=2)}
+
+    assert sorted(results) == [0, 1, 2, 3]
+    assert results[1] == (None, "Parser process crashed")
+    for i in (0, 2, 3):
+        assert results[i] == ({"full_text": files[i].decode(), "offsets": {}}, None)
@@ -0,0 +1,41 @@
+from core.skills import SkillMatcher, tokenize
+
+TAXONOMY = {
+    "languages": ["Python", "Java", "JavaScript", "C++", "C#"],
+    "ml": ["machine learning", "deep learning", "learning to rank", "nlp"],
+    "web": ["node.js", "scikit-learn", "react native", "react"],
+}
+
+
+def test_tokenize_keeps_symbol_tokens():
+    assert tokenize("C++, C#, Node.js and scikit-learn.") == ["c++", "c#", "node.js", "and", "scikit-learn"]
+
+
+def test_matches_fall_on_token_boundaries():
+    matcher = SkillMatcher(TAXONOMY)
+
+    assert matcher.find("JavaScript developer") == ["JavaScript"]
+    assert matcher.find("java, c++ and c#") == ["Java", "C++", "C#"]
+
+
+def test_multi_word_skills_and_overlaps():
+    matcher = SkillMatcher(TAXONOMY)
+
+    # "learning to rank" fails part-way; the automaton falls back without rescanning
+    assert matcher.find("deep learning to ranking models") == ["deep learning"]
+    assert matcher.find("machine learning to rank") == ["machine learning", "learning to rank"]
+    assert matcher.find("react native apps") == ["react", "react native"]
+
+
+def test_unique_in_order_of_first_occurrence():
+    matcher = SkillMatcher(TAXONOMY)
+
+    assert matcher.find("nlp, Python, node.js, python, NLP") == ["nlp", "Python", "node.js"]
+    assert matcher.categories["node.js"] == "web"
+
+
+def test_flat_taxonomy_has_no_categories():
+    matcher = SkillMatcher(["sql", "", "sql"])
+
+    assert matcher.find("SQL and sql") == ["sql"]
+    assert matcher.categories == {"sql": None}
@@ -0,0 +1,64 @@
+import os
+
+import pytest
+
+pytest.importorskip("numpy")
+pytest.importorskip("sklearn")
+pytest.importorskip("pypdf")
+
+from core.engine import MatchingEngine  # noqa: E402
+from core.parse_cache import build_record  # noqa: E402
+from core.parser import ResumeParser  # noqa: E402
+from core.talent_pool import TalentPool  # noqa: E402
+
+CONFIG = os.path.join(os.path.dirname(__file__), "..", "data", "config.yaml")
+
+RESUMES = {
+    "alice": "Alice\nalice@example.com\nExperience\nPython and Django backend developer\nSkills\npython django aws",
+    "bob": "Bob\nbob@example.com\nExperience\nJava Spring engineer\nSkills\njava spring kubernetes",
+    "carol": "Carol\nExperience\nData scientist using Python pandas\nSkills\npython pandas numpy",
+}
+
+
+def _entry(name, text):
+    segments = {"full_text": text, "offsets": ResumeParser().segment_offsets(text)}
+    return {"name": name, "record": dict(build_record(segments), content_hash=f"hash-{name}")}
+
+
+@pytest.fixture
+def pool(tmp_path):
+    pool = TalentPool(str(tmp_path / "app.sqlite"))
+    pool.add_many(_entry(name, text) for name, text in RESUMES.items())
+    return pool
+
+
+@pytest.fixture
+def engine(tmp_path):
+    return MatchingEngine(config_path=CONFIG, db_path=str(tmp_path / "app.sqlite"))
+
+
+def test_add_many_skips_known_resumes(pool):
+    assert pool.count() == 3
+    assert pool.add_many([_entry("alice", RESUMES["alice"]), _entry("dave", "Dave\nGo developer")]) == 1
+    assert pool.count() == 4
+
+
+def test_search_ranks_shortlist_with_engine(pool, engine):
+    results = pool.search("Senior Python Django developer", engine)
+
+    names = [r["name"] for r in results]
+    assert names[0] == "alice"
+    # bob shares no JD term, so FTS never shortlists him
+    assert "bob" not in names
+    assert results[0]["contact"]["email"] == "alice@example.com"
+    scores = [r["match"]["score"] for r in results]
+    assert scores == sorted(scores, reverse=True)
+
+
+def test_search_respects_top_k(pool, engine):
+    assert len(pool.search("python developer", engine, top_k=1)) == 1
+
+
+def test_search_without_usable_terms(pool, engine):
+    assert pool.search("the and of", engine) == []
+    assert pool.search("rust elixir", engine) == []
@@ -0,0 +1,40 @@
+from utils.text_utils import TextNormalizer, clean_sections
+
+PROTECTED = ("c++", "c#", "node.js", "3d", ".net")
+
+
+def test_plain_clean_keeps_only_letters():
+    assert TextNormalizer().clean("Senior C++ dev, 5+ yrs!\tAWS\n") == "senior c dev yrs aws"
+    assert TextNormalizer().clean("") == ""
+
+
+def test_protected_tokens_survive_verbatim():
+    normalizer = TextNormalizer(PROTECTED)
+
+    assert normalizer.clean("Senior C++/C# dev, Node.js & 3D!") == "senior c++ c# dev node.js 3d"
+    assert normalizer.clean(".NET services") == ".net services"
+
+
+def test_protected_tokens_match_whole_tokens_only():
+    normalizer = TextNormalizer(PROTECTED)
+
+    assert normalizer.clean("abc# 13d c++11") == "abc d c"
+    assert normalizer.clean("node.jsx c+++") == "nodejsx c"
+
+
+def test_unicode_spaces_separate_words():
+    assert TextNormalizer().clean("Ingénieur données python") == "ingnieur donnes python"
+
+
+def test_signature_depends_only_on_the_protected_set():
+    assert TextNormalizer(("C++", "", "c#")).signature == TextNormalizer(("c#", "c++")).signature
+    assert TextNormalizer(("c++",)).signature != TextNormalizer().signature
+
+
+def test_clean_sections_slices_offsets():
+    text = "Skills\nC++ and Python\nProjects\nA 3D engine"
+    segments = {"full_text": text, "offsets": {"skills": [[0, 22]], "projects": [[22, len(text)]]}}
+
+    sections = clean_sections(segments, ("skills", "projects", "education"), TextNormalizer(PROTECTED))
+
+    assert sections == {"skills": "skills c++ and python", "projects": "projects a 3d engine", "education": ""}
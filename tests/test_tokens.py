@@ -0,0 +1,67 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("sklearn")
+
+from core.engine import make_presence_vectorizer, make_vectorizer  # noqa: E402
+from core.tokens import MatrixBuilder  # noqa: E402
+from utils.text_utils import TextNormalizer  # noqa: E402
+
+RAW = [
+    "Senior Python Developer with Django and AWS experience.",
+    "Python/Django developer; AWS, Docker & Kubernetes (5+ yrs).",
+    "C++ and C# engineer building Node.js services for 3D rendering",
+    "The and of",
+    "",
+    "Ingénieur données: Python, machine learning — NLP, pandas",
+    "python python python developer developer aws",
+]
+
+# Cleaned text takes the a-z fast path in TokenizedDoc, raw text the regex path
+TEXTS = RAW + TextNormalizer(("c++", "c#", "node.js", "3d")).clean_many(RAW)
+
+
+@pytest.mark.parametrize("chunk_size", [None, 1, 4])
+def test_tfidf_matches_vectorizer(chunk_size):
+    vectorizer = make_vectorizer()
+    expected = vectorizer.fit_transform(TEXTS)
+
+    matrix, names, idf = MatrixBuilder().add_many(TEXTS).tfidf(chunk_size=chunk_size)
+
+    assert list(names) == list(vectorizer.get_feature_names_out())
+    np.testing.assert_allclose(idf, vectorizer.idf_)
+    np.testing.assert_allclose(matrix.toarray(), expected.toarray(), atol=1e-12)
+
+
+def test_tfidf_float32_and_fixed_idf():
+    vectorizer = make_vectorizer()
+    expected = vectorizer.fit_transform(TEXTS)
+    _, _, idf = MatrixBuilder().add_many(TEXTS).tfidf()
+
+    matrix, _, _ = MatrixBuilder().add_many(TEXTS).tfidf(dtype=np.float32, chunk_size=3, idf=idf)
+
+    assert matrix.dtype == np.float32
+    np.testing.assert_allclose(matrix.toarray(), expected.toarray(), atol=1e-6)
+
+
+def test_non_document_rows_use_document_idf():
+    section = "python developer aws"
+    vectorizer = make_vectorizer().fit(TEXTS)
+
+    builder = MatrixBuilder().add_many(TEXTS)
+    builder.add(section, document=False)
+    matrix, names, _ = builder.tfidf(chunk_size=5)
+
+    assert list(names) == list(vectorizer.get_feature_names_out())
+    np.testing.assert_allclose(matrix[-1].toarray(), vectorizer.transform([section]).toarray(), atol=1e-12)
+    np.testing.assert_allclose(matrix[:-1].toarray(), vectorizer.transform(TEXTS).toarray(), atol=1e-12)
+
+
+def test_presence_matches_vectorizer():
+    vectorizer = make_presence_vectorizer()
+    expected = vectorizer.fit_transform(TEXTS)
+
+    matrix, tokens = MatrixBuilder(tokens=True).add_many(TEXTS).presence()
+
+    assert list(tokens) == list(vectorizer.get_feature_names_out())
+    np.testing.assert_array_equal(matrix.toarray(), expected.toarray())
@@ -0,0 +1,59 @@
+import re
+
+# Contact details sit in the header of almost every resume; only this many
+# leading characters are searched unless a caller asks for more (0: all)
+DEFAULT_WINDOW = 5000
+
+EMAIL_RE = re.compile(r'[\w\.-]+@[\w\.-]+\.\w+')
+# The lookahead rejects positions that cannot start a number before any
+# backtracking; matches are the same as without it
+PHONE_RE = re.compile(r'(?=[+(\d])(\+?\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}')
+
+NOT_FOUND = "Not found"
+
+# How far past the window to look for the line break that ends it
+_MAX_LINE_TAIL = 256
+
+
+def _window_end(text, window):
+    """End of the search window, moved to a nearby line break so no contact is cut in half."""
+    if not window or len(text) <= window:
+        return len(text)
+    end = text.find('\n', window, window + _MAX_LINE_TAIL)
+    return window if end == -1 else end
+
+
+def _email_start(text, end):
+    """
+    Where an email search can start: the run of [\\w.-] characters before the
+    first '@'. Nothing earlier can match, so the regex skips the bulk of the text.
+    """
+    at = text.find('@', 0, end)
+    if at == -1:
+        return None
+    start = at
+    while start and (text[start - 1].isalnum() or text[start - 1] in "_.-"):
+        start -= 1
+    return start
+
+
+def extract_contact_info(text, window=DEFAULT_WINDOW):
+    """Finds the first email and phone number in the head of the raw text."""
+    end = _window_end(text, window)
+    start = _email_start(text, end)
+    email = None if start is None else EMAIL_RE.search(text, start, end)
+    phone = PHONE_RE.search(text, 0, end)
+
+    return {
+        "email": email.group(0) if email else NOT_FOUND,
+        "phone": phone.group(0) if phone else NOT_FOUND
+    }
+
+
+def get_contact_window(config_path="data/config.yaml"):
+    """Search window from the config's ingestion settings."""
+    from core.config import get_config  # core.config imports utils
+    try:
+        return get_config(config_path).contact_window
+    except OSError:
+        return DEFAULT_WINDOW
@@ -1,18 +1,109 @@
+import hashlib
 import re
+import string
 
-def extract_contact_info(text):
-    """Finds email and phone numbers in raw text."""
-    email = re.search(r'[\w\.-]+@[\w\.-]+\.\w+', text)
-    phone = re.search(r'(\+?\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}', text)
-    
-    return {
-        "email": email.group(0) if email else "Not found",
-        "phone": phone.group(0) if phone else "Not found"
-    }
-
-def clean_text(text):
-    if not text: return ""
-    text = text.lower()
-    text = re.sub(r'[^a-z\s]', '', text)
-    text = " ".join(text.split())
-    return text
\ No newline at end of file
+# Contact extraction lives in utils.contact_utils; kept importable from here
+from utils.contact_utils import extract_contact_info  # noqa: F401
+
+# Bump when TextNormalizer output changes so cached cleaned text is redone
+NORMALIZER_VERSION = 1
+
+# Always kept verbatim, on top of the non-alphabetic tokens of the config taxonomy
+DEFAULT_PROTECTED = ("c++", "c#", "f#", "node.js", ".net", "3d")
+
+# Non-ASCII whitespace (as str.isspace sees it; all of it lives below U+3001) -> space
+_UNICODE_SPACES = {cp: " " for cp in range(128, 0x3001) if chr(cp).isspace()}
+
+# Byte-level table over the ASCII-encoded text: whitespace -> space; a-z kept;
+# A-Z kept too, which only ever appear in protected-token placeholders since
+# the text is lowercased first; everything else deleted
+_SPACES = {i for i in range(128) if chr(i).isspace()}
+_KEEP = set((string.ascii_lowercase + string.ascii_uppercase).encode())
+_BYTE_TABLE = bytes(32 if i in _SPACES else i for i in range(256))
+_BYTE_DELETE = bytes(i for i in range(256) if i not in _KEEP and i not in _SPACES)
+
+_WORD_CHARS = frozenset(string.ascii_lowercase + string.digits)
+
+
+class TextNormalizer:
+    """
+    Lowercase, keep only a-z and whitespace, collapse whitespace: one
+    translate over the ASCII bytes and one split/join instead of a regex
+    substitution. Tokens in `protected` (e.g. "c++", "c#", "node.js", "3d")
+    survive verbatim.
+    """
+
+    def __init__(self, protected=()):
+        self.protected = tuple(sorted({p.lower() for p in protected if p}, key=lambda p: (-len(p), p)))
+        self.signature = f"{NORMALIZER_VERSION}:" + hashlib.sha1("\n".join(self.protected).encode()).hexdigest()[:12]
+        self._protected_re = None
+        if self.protected:
+            self._protected_re = re.compile(
+                "(?:" + "|".join(map(re.escape, self.protected)) + r")(?![a-z0-9+#])"
+            )
+            # Uppercase-only stand-ins survive the byte translate untouched
+            self._placeholders = {
+                token: "Q" + "".join(chr(65 + int(d, 16)) for d in f"{i:x}") + "Q"
+                for i, token in enumerate(self.protected)
+            }
+
+    def clean(self, text):
+        if not text:
+            return ""
+        text = text.lower()
+        if not text.isascii():
+            text = text.translate(_UNICODE_SPACES)
+        shielded = None
+        if self._protected_re is not None:
+            shielded = set()
+            text = self._protected_re.sub(lambda m: self._shield(m, shielded), text)
+        cleaned = b" ".join(
+            text.encode('ascii', 'ignore').translate(_BYTE_TABLE, _BYTE_DELETE).split()
+        ).decode('ascii')
+        for token in shielded or ():
+            cleaned = cleaned.replace(self._placeholders[token], token)
+        return cleaned
+
+    def _shield(self, match, shielded):
+        # Whole tokens only: "c#" in "abc#" or "3d" in "13d" is left alone
+        start = match.start()
+        if start and match.string[start - 1] in _WORD_CHARS:
+            return match.group(0)
+        token = match.group(0)
+        shielded.add(token)
+        return f" {self._placeholders[token]} "
+
+    def clean_many(self, texts):
+        return [self.clean(text) for text in texts]
+
+
+_plain = TextNormalizer()
+
+
+def get_normalizer(config_path="data/config.yaml"):
+    """Normalizer protecting the config taxonomy's tokens, shared through the config service."""
+    from core.config import get_config  # core.config imports this module
+    try:
+        return get_config(config_path).normalizer
+    except OSError:
+        return _plain
+
+
+def clean_text(text, normalizer=None):
+    return (normalizer or get_normalizer()).clean(text)
+
+
+def clean_many(texts, normalizer=None):
+    """Cleans a list of documents in one call, with one normalizer lookup."""
+    return (normalizer or get_normalizer()).clean_many(texts)
+
+
+def section_text(segments, section):
+    """Raw text of one section of a parsed resume, sliced from its offsets ("" if absent)."""
+    text = segments.get("full_text", "")
+    return " ".join(text[a:b] for a, b in segments.get("offsets", {}).get(section, ()))
+
+
+def clean_sections(segments, sections, normalizer=None):
+    """{section: cleaned text} for the named sections of a parsed resume, in one batch call."""
+    return dict(zip(sections, clean_many([section_text(segments, s) for s in sections], normalizer)))
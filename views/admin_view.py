@@ -1,7 +1,7 @@
 import streamlit as st
 import yaml
-import os
 from datetime import datetime
+from core.config import get_config, save_config
 
 def render():
     # Custom CSS for admin view
@@ -112,10 +112,9 @@ def render():
     
     config_path = "data/config.yaml"
     
-    # Load current config with error handling
+    # Load current config with error handling (editable copy of the shared config)
     try:
-        with open(config_path, 'r') as f:
-            config = yaml.safe_load(f)
+        config = get_config(config_path).as_dict()
     except FileNotFoundError:
         st.error("⚠️ Configuration file not found. Please ensure data/config.yaml exists.")
         return
@@ -325,9 +324,8 @@ def render():
                 with open(backup_path, 'w') as backup:
                     backup.write(f.read())
             
-            # Save new config
-            with open(config_path, 'w') as f:
-                yaml.dump(config, f, default_flow_style=False, sort_keys=False)
+            # Save new config; bumps config_version so every session picks it up
+            saved = save_config(config, config_path)
             
             st.markdown("""
             <div class="success-animation">
@@ -343,6 +341,7 @@ def render():
                 st.write(f"**Total Skills Configured:** {total_skills}")
                 st.write(f"**Semantic Weight:** {new_cos:.0%}")
                 st.write(f"**Keyword Weight:** {new_jac:.0%}")
+                st.write(f"**Config Version:** {saved.version}")
                 st.write(f"**Timestamp:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
             
         except Exception as e:
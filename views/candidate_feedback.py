@@ -1,9 +1,9 @@
 import streamlit as st
-from core.parser import ResumeParser
-from core.engine import MatchingEngine
+from core.skills import get_skill_matcher
+from core.tokens import as_docs
 from utils.text_utils import clean_text
-import yaml
 from datetime import datetime
+from views.resources import get_engine, get_parse_cache, get_parser
 
 def render():
     # Custom CSS for candidate feedback view
@@ -267,18 +267,22 @@ def render():
             st.warning("⚠️ Please provide both the job description and your resume.")
             return
 
-        parser = ResumeParser()
-        engine = MatchingEngine()
+        parser = get_parser()
+        engine = get_engine()
 
         with st.spinner("🤖 AI is analyzing your profile against the job requirements..."):
             try:
-                # Parse and segment
-                segmented = parser.parse(user_resume)
-                cleaned_resume = clean_text(segmented['full_text'])
-                cleaned_jd = clean_text(target_jd)
+                # Parse and segment (reuses a cached parse of the same PDF)
+                _, record, error = next(get_parse_cache().parse_many(parser, [user_resume]))
+                if error:
+                    raise ValueError(error)
+                segmented = record['segments']
+                # Tokenized once, shared by scoring and the skills gap analysis
+                jd_doc, resume_doc = as_docs([clean_text(target_jd), record['cleaned']])
 
-                # Get matching data
-                match_data = engine.run_tfidf_match(cleaned_jd, [cleaned_resume])[0]
+                # Get matching data; a self-check reads the reference IDF model
+                # recruiters rank with but never adds to it
+                match_data = engine.run_model_match(jd_doc, [resume_doc], update_model=False)[0]
                 
                 # Score Display
                 score = match_data['score']
@@ -334,7 +338,7 @@ def render():
                     """, unsafe_allow_html=True)
                 
                 with col3:
-                    sections_found = sum([1 for v in segmented.values() if v and v != segmented.get('full_text')])
+                    sections_found = sum([1 for spans in segmented['offsets'].values() if spans])
                     st.markdown(f"""
                     <div class="stat-mini">
                         <div class="stat-mini-value">{sections_found}</div>
@@ -356,18 +360,12 @@ def render():
                 # Gap Analysis
                 st.markdown("### 🎯 Skills Gap Analysis")
                 
-                # Load taxonomy for better suggestions
-                try:
-                    with open("data/config.yaml", "r") as f:
-                        config = yaml.safe_load(f)
-                    
-                    all_tech_skills = [skill for cat in config.get('taxonomy', {}).values() for skill in cat]
-                except:
-                    all_tech_skills = []
-                
-                found_in_jd = [s for s in all_tech_skills if s in cleaned_jd]
-                found_in_res = [s for s in all_tech_skills if s in cleaned_resume]
-                missing = list(set(found_in_jd) - set(found_in_res))
+                # Taxonomy skills, matched on token boundaries in one pass per text
+                skill_matcher = get_skill_matcher()
+                found_in_jd = skill_matcher.find_tokens(jd_doc.skill_tokens)
+                found_in_res = skill_matcher.find_tokens(resume_doc.skill_tokens)
+                resume_skills = set(found_in_res)
+                missing = [s for s in found_in_jd if s not in resume_skills]
                 
                 col1, col2 = st.columns(2)
                 
@@ -418,7 +416,7 @@ def render():
                     """, unsafe_allow_html=True)
                 
                 # Priority: High - Formatting Issues
-                if not segmented.get('experience'):
+                if not segmented['offsets'].get('experience'):
                     suggestions_count += 1
                     st.markdown("""
                     <div class="priority-high">
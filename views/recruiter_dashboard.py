@@ -1,10 +1,11 @@
+import math
 import streamlit as st
 import pandas as pd
-from core.parser import ResumeParser
-from core.engine import MatchingEngine
-from utils.text_utils import extract_contact_info, clean_text
+from core.jobs import ACTIVE_STATUSES, get_job_queue
+from core.talent_pool import TalentPool
+from core.timing import file_rows, summary_rows
 from datetime import datetime
-import time
+from views.resources import get_engine
 
 def render():
     # Custom CSS for recruiter dashboard
@@ -216,6 +217,20 @@ def render():
     
     st.markdown("<br>", unsafe_allow_html=True)
     
+    # Candidate source: a fresh upload, or everyone already in the talent pool
+    source = st.radio(
+        "Candidate Source",
+        ["📎 Upload resumes", "🗂️ Search the talent pool"],
+        horizontal=True,
+        help="The talent pool holds every resume analyzed before, indexed for instant search."
+    )
+    
+    st.markdown("<br>", unsafe_allow_html=True)
+    
+    if source == "🗂️ Search the talent pool":
+        _render_pool_search(jd_text)
+        return
+    
     # Upload Section
     st.markdown("""
     <div class="section-header">
@@ -238,6 +253,26 @@ def render():
             for idx, file in enumerate(uploaded_files, 1):
                 st.text(f"{idx}. {file.name} ({file.size / 1024:.1f} KB)")
     
+    # Shortlist controls: only the best candidates are materialised
+    col_k, col_min = st.columns(2)
+    with col_k:
+        shortlist_size = st.number_input(
+            "Shortlist Size",
+            min_value=1,
+            max_value=max(len(uploaded_files or []), 1),
+            value=min(max(len(uploaded_files or []), 1), 50),
+            help="How many of the best-matching candidates to rank and explain."
+        )
+    with col_min:
+        min_score = st.slider(
+            "Minimum Match Score",
+            min_value=0,
+            max_value=100,
+            value=0,
+            step=5,
+            help="Candidates scoring below this are left out of the shortlist."
+        )
+    
     st.markdown("<br>", unsafe_allow_html=True)
     
     # Action buttons
@@ -251,220 +286,388 @@ def render():
         )
     with col2:
         if st.button("🔄 Clear All", use_container_width=True):
+            _forget_job()
             st.rerun()
     with col3:
         if uploaded_files and jd_text:
             st.metric("Ready", f"{len(uploaded_files)} files", delta="Go!")
 
-    # Analysis Logic
+    queue = get_job_queue()
+
+    # Analysis Logic: the batch runs on a background worker, so touching a
+    # widget or refreshing the page no longer restarts or kills it
     if analyze_button:
         if not jd_text or not uploaded_files:
             st.warning("⚠️ Please provide both a job description and candidate resumes.")
             return
+        job_id = queue.submit(jd_text, uploaded_files, top_k=int(shortlist_size), min_score=min_score or None)
+        st.session_state["batch_job"] = job_id
+        # Kept in the URL too, so a refreshed page can reattach to the job
+        st.query_params["job"] = job_id
 
-        parser = ResumeParser()
-        engine = MatchingEngine()
-        
-        all_results = []
-        
-        # Progress tracking
-        progress_bar = st.progress(0)
-        status_text = st.empty()
-        
+    job_id = st.session_state.get("batch_job") or st.query_params.get("job")
+    if job_id:
+        _render_job(queue, job_id)
+    elif not uploaded_files or not jd_text:
+        # Empty state when no analysis has been run
+        st.markdown("""
+        <div class="empty-state">
+            <div class="empty-state-icon">🎯</div>
+            <h3>Ready to Find Top Talent?</h3>
+            <p>Upload job description and candidate resumes to get started</p>
+        </div>
+        """, unsafe_allow_html=True)
+
+
+def _forget_job():
+    st.session_state.pop("batch_job", None)
+    st.session_state.pop("upload_shortlist", None)
+    if "job" in st.query_params:
+        del st.query_params["job"]
+
+
+def _render_job(queue, job_id):
+    """Live progress while a batch job runs, then its final results."""
+    # A finished job's results live in the session: reruns are pure rendering
+    shortlist = st.session_state.get("upload_shortlist")
+    if shortlist and shortlist["key"] == job_id:
+        _render_job_outcome(shortlist)
+        return
+
+    snapshot = queue.get(job_id)
+    if snapshot is None:
+        _forget_job()
+        return
+    st.session_state["batch_job"] = job_id
+
+    if snapshot["status"] in ACTIVE_STATUSES:
+        # Only this fragment re-runs while the job is active, once a second
+        st.fragment(_render_job_progress, run_every=1.0)(queue, job_id)
+    else:
+        shortlist = _job_shortlist(snapshot)
+        st.session_state["upload_shortlist"] = shortlist
+        _render_job_outcome(shortlist)
+
+
+def _render_job_progress(queue, job_id):
+    """Progress bar, cancel button and the provisional ranking so far."""
+    snapshot = queue.get(job_id)
+    if snapshot["status"] not in ACTIVE_STATUSES:
+        # Finished: redraw the whole page with the final results
+        st.rerun()
+
+    total, done = snapshot["total"], snapshot["done"]
+    col1, col2 = st.columns([4, 1])
+    with col1:
+        label = "Queued..." if snapshot["status"] == "queued" else f"Parsed {done}/{total} resumes"
+        st.progress(done / total if total else 0.0, text=label)
+    with col2:
+        if st.button("⏹️ Cancel", use_container_width=True):
+            queue.cancel(job_id)
+
+    for error in snapshot["errors"]:
+        st.error(f"Error processing {error}")
+
+    if snapshot["results"]:
+        st.caption(f"Provisional ranking of the {snapshot['parsed']} resumes parsed so far; "
+                   "scores settle once the whole batch is in.")
+        rows = [_result_row(hit['name'], hit['contact'], hit['match']) for hit in snapshot["results"]]
+        st.dataframe(pd.DataFrame(rows), use_container_width=True, hide_index=True)
+
+
+def _job_shortlist(snapshot):
+    """Compact, render-ready result of a finished job, kept in session state."""
+    return {
+        "key": snapshot["id"],
+        "status": snapshot["status"],
+        "total": snapshot["total"],
+        "done": snapshot["done"],
+        "parsed": snapshot["parsed"],
+        "min_score": snapshot["min_score"],
+        "errors": snapshot["errors"],
+        "timings": snapshot["timings"],
+        "rows": [_result_row(hit['name'], hit['contact'], hit['match']) for hit in snapshot["results"]],
+    }
+
+
+def _render_job_outcome(snapshot):
+    """Final (or partial, if cancelled/interrupted) results of a batch job, from its shortlist."""
+    status = snapshot["status"]
+    for error in snapshot["errors"]:
+        st.error(f"Error processing {error}")
+    if status == "cancelled":
+        st.info(f"⏹️ Analysis cancelled after {snapshot['done']} of {snapshot['total']} resumes; "
+                "the ranking covers those only.")
+    elif status == "interrupted":
+        st.warning("⚠️ This analysis was interrupted by a server restart. Run it again; "
+                   "resumes parsed before are served from the cache.")
+    elif status == "failed":
+        st.error("❌ The analysis failed.")
+
+    if snapshot["timings"]:
+        _render_performance(snapshot["timings"])
+
+    if not snapshot["parsed"]:
+        if status == "done":
+            st.error("❌ No resumes could be processed successfully.")
+        return
+
+    if not snapshot["rows"]:
+        st.warning(f"⚠️ None of the {snapshot['parsed']} candidates scored at least {snapshot['min_score'] or 0}%.")
+        return
+
+    _render_results(snapshot["rows"], total_candidates=snapshot["parsed"], key="upload")
+
+
+def _render_performance(timings):
+    """Collapsible per-stage and per-file timings (a StageTimer.to_dict()) for a run."""
+    with st.expander(f"⏱️ Performance ({timings['wall_s']:.2f}s wall)"):
+        st.caption(
+            f"Run total: {timings['wall_s']:.2f}s wall, {timings['cpu_s']:.2f}s CPU in the app process. "
+            "Parse CPU is measured in the worker processes, so it can exceed wall time."
+        )
+        st.dataframe(pd.DataFrame(summary_rows(timings)), use_container_width=True, hide_index=True)
+        if timings["per_file"]:
+            st.markdown("**Per file**")
+            st.dataframe(pd.DataFrame(file_rows(timings)), use_container_width=True, hide_index=True)
+
+
+def _render_pool_search(jd_text):
+    """Runs the JD against every stored resume and shows the ranked top-k."""
+    pool = TalentPool()
+    pool_size = pool.count()
+    
+    col1, col2 = st.columns([2, 1])
+    with col1:
+        top_k = st.slider("Candidates to return", min_value=5, max_value=100, value=20, step=5)
+    with col2:
+        st.metric("Talent Pool", f"{pool_size:,} resumes")
+    
+    search_button = st.button(
+        "🔎 Search Talent Pool",
+        type="primary",
+        use_container_width=True,
+        disabled=not (jd_text and pool_size)
+    )
+    
+    if search_button:
         try:
-            for idx, file in enumerate(uploaded_files):
-                progress = (idx + 1) / len(uploaded_files)
-                progress_bar.progress(progress)
-                status_text.text(f"Analyzing {file.name}... ({idx + 1}/{len(uploaded_files)})")
-                
-                try:
-                    # Parse and segment
-                    segmented = parser.parse(file)
-                    contact = extract_contact_info(segmented['full_text'])
-                    cleaned = clean_text(segmented['full_text'])
-                    
-                    # Match using Engine
-                    match_data = engine.run_tfidf_match(clean_text(jd_text), [cleaned])[0]
-                    
-                    all_results.append({
-                        "Candidate Name": file.name.replace('.pdf', ''),
-                        "Match Score": round(match_data['score'], 2),
-                        "Email": contact.get('email', 'N/A'),
-                        "Phone": contact.get('phone', 'N/A'),
-                        "Top Skills Found": ", ".join(match_data.get('keywords', [])[:5]).upper() if match_data.get('keywords') else "N/A",
-                        "Status": "🌟 Top Talent" if match_data['score'] > 75 else "📋 Screening",
-                        "Skills Count": len(match_data.get('keywords', []))
-                    })
-                    
-                except Exception as e:
-                    st.error(f"Error processing {file.name}: {str(e)}")
-                    continue
-                
-                time.sleep(0.1)  # Small delay for visual feedback
-            
-            progress_bar.empty()
-            status_text.empty()
-            
-            if not all_results:
-                st.error("❌ No resumes could be processed successfully.")
-                return
-            
-            # Create DataFrame
-            df = pd.DataFrame(all_results).sort_values(by="Match Score", ascending=False)
-            
-            # Summary Metrics
-            st.markdown("<br>", unsafe_allow_html=True)
-            st.markdown("""
-            <div class="section-header">
-                <span class="section-icon">📊</span>
-                <h2 class="section-title">Analysis Summary</h2>
-            </div>
-            """, unsafe_allow_html=True)
-            
-            metric_col1, metric_col2, metric_col3, metric_col4 = st.columns(4)
-            
-            with metric_col1:
-                st.metric(
-                    label="Total Candidates",
-                    value=len(df),
-                    delta=None
-                )
-            
-            with metric_col2:
-                top_talent = len(df[df['Match Score'] > 75])
-                st.metric(
-                    label="Top Talent",
-                    value=top_talent,
-                    delta=f"{(top_talent/len(df)*100):.0f}%"
-                )
-            
-            with metric_col3:
-                avg_score = df['Match Score'].mean()
-                st.metric(
-                    label="Avg Match Score",
-                    value=f"{avg_score:.1f}%",
-                    delta=None
-                )
-            
-            with metric_col4:
-                best_match = df['Match Score'].max()
-                st.metric(
-                    label="Best Match",
-                    value=f"{best_match:.1f}%",
-                    delta="Top Pick"
-                )
-            
-            # Results Table
-            st.markdown("<br>", unsafe_allow_html=True)
-            st.markdown("""
-            <div class="section-header">
-                <span class="section-icon">🏆</span>
-                <h2 class="section-title">Ranked Shortlist</h2>
-            </div>
-            """, unsafe_allow_html=True)
-            
-            # Style the dataframe
-            def highlight_score(val):
-                if isinstance(val, (int, float)):
-                    if val > 75:
-                        return 'background-color: #d1fae5; color: #065f46; font-weight: 600'
-                    elif val > 50:
-                        return 'background-color: #fef3c7; color: #92400e; font-weight: 600'
-                    else:
-                        return 'background-color: #f3f4f6; color: #4b5563'
-                return ''
-            
-            styled_df = df.style.applymap(highlight_score, subset=['Match Score'])
-            st.dataframe(styled_df, use_container_width=True, height=400)
-            
-            # Export Options
-            col_export1, col_export2 = st.columns(2)
-            
-            with col_export1:
-                csv = df.to_csv(index=False).encode('utf-8')
-                timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-                st.download_button(
-                    label="📥 Download Full Report (CSV)",
-                    data=csv,
-                    file_name=f'candidate_shortlist_{timestamp}.csv',
-                    mime='text/csv',
-                    use_container_width=True
-                )
-            
-            with col_export2:
-                top_candidates = df.head(5).to_csv(index=False).encode('utf-8')
-                st.download_button(
-                    label="⭐ Download Top 5 Only (CSV)",
-                    data=top_candidates,
-                    file_name=f'top_5_candidates_{timestamp}.csv',
-                    mime='text/csv',
-                    use_container_width=True
-                )
-            
-            # Top Pick Spotlights
-            st.markdown("<br>", unsafe_allow_html=True)
-            st.markdown("""
-            <div class="section-header">
-                <span class="section-icon">🌟</span>
-                <h2 class="section-title">Top Candidate Spotlights</h2>
-            </div>
-            """, unsafe_allow_html=True)
-            
-            top_3 = df.head(3)
-            cols = st.columns(3)
-            
-            for idx, (_, row) in enumerate(top_3.iterrows()):
-                with cols[idx]:
-                    # Score circle
-                    score = row['Match Score']
-                    if score > 75:
-                        score_class = 'score-high'
-                    elif score > 50:
-                        score_class = 'score-medium'
-                    else:
-                        score_class = 'score-low'
-                    
-                    st.markdown(f"""
-                    <div class="candidate-card">
-                        <div class="score-circle {score_class}">
-                            {score:.0f}%
-                        </div>
-                        <h3 style="text-align: center; margin: 0 0 0.5rem 0;">
-                            {row['Candidate Name'][:30]}
-                        </h3>
-                        <div style="text-align: center; margin-bottom: 1rem;">
-                            <span class="{'top-talent-badge' if score > 75 else 'screening-badge'}">
-                                {row['Status']}
-                            </span>
-                        </div>
-                        <div class="contact-info">
-                            <span>📧</span>
-                            <span>{row['Email']}</span>
-                        </div>
-                        <div class="contact-info">
-                            <span>📱</span>
-                            <span>{row['Phone']}</span>
-                        </div>
-                        <div style="margin-top: 1rem;">
-                            <strong style="font-size: 0.875rem; color: #4b5563;">Key Skills:</strong>
-                            <div style="margin-top: 0.5rem;">
-                                {' '.join([f'<span class="skill-tag">{skill.strip()}</span>' for skill in row['Top Skills Found'].split(',')[:3]])}
-                            </div>
-                        </div>
-                    </div>
-                    """, unsafe_allow_html=True)
-            
+            with st.spinner(f"Searching {pool_size:,} stored resumes..."):
+                hits = pool.search(jd_text, get_engine(), top_k=top_k)
         except Exception as e:
-            st.error(f"❌ An error occurred during analysis: {str(e)}")
+            st.error(f"❌ An error occurred during the search: {str(e)}")
             st.exception(e)
+            return
+        # Kept in the session so downloads and other reruns don't search again
+        st.session_state["pool_shortlist"] = {
+            "jd_text": jd_text,
+            "rows": [_result_row(hit['name'], hit['contact'], hit['match']) for hit in hits],
+        }
     
-    else:
-        # Empty state when no analysis has been run
-        if not uploaded_files or not jd_text:
-            st.markdown("""
-            <div class="empty-state">
-                <div class="empty-state-icon">🎯</div>
-                <h3>Ready to Find Top Talent?</h3>
-                <p>Upload job description and candidate resumes to get started</p>
+    shortlist = st.session_state.get("pool_shortlist")
+    if shortlist is None:
+        if not pool_size:
+            st.info("ℹ️ The talent pool is empty. Resumes are added automatically when you run a batch analysis.")
+        return
+    
+    if shortlist["jd_text"] != jd_text:
+        st.caption("ℹ️ Showing results for the job description as last searched. Search again to refresh them.")
+    if not shortlist["rows"]:
+        st.warning("⚠️ No stored resumes matched this job description.")
+        return
+    
+    _render_results(shortlist["rows"], key="pool")
+
+def _result_row(name, contact, match_data):
+    """One row of the ranked shortlist."""
+    keywords = match_data.get('keywords', [])
+    return {
+        "Candidate Name": name,
+        "Match Score": round(match_data['score'], 2),
+        "Email": contact.get('email') or 'N/A',
+        "Phone": contact.get('phone') or 'N/A',
+        "Top Skills Found": ", ".join(keywords[:5]).upper() if keywords else "N/A",
+        "Status": "🌟 Top Talent" if match_data['score'] > 75 else "📋 Screening",
+        "Skills Count": len(keywords)
+    }
+
+
+def _render_results(all_results, total_candidates=None, key="results", page_size=25):
+    """
+    Summary metrics, ranked table, exports and spotlights for a shortlist.
+    Rows arrive already ranked best first; total_candidates is how many were scored.
+    Filtering, sorting, paging and exports only reshape these rows, so they
+    never trigger a re-score. `key` keeps widget state apart per result set.
+    """
+    # Create DataFrame (shortlist only, no full sort needed)
+    df = pd.DataFrame(all_results)
+    total_candidates = total_candidates or len(df)
+
+    # Summary Metrics
+    st.markdown("<br>", unsafe_allow_html=True)
+    st.markdown("""
+    <div class="section-header">
+        <span class="section-icon">📊</span>
+        <h2 class="section-title">Analysis Summary</h2>
+    </div>
+    """, unsafe_allow_html=True)
+
+    metric_col1, metric_col2, metric_col3, metric_col4 = st.columns(4)
+
+    with metric_col1:
+        st.metric(
+            label="Total Candidates",
+            value=total_candidates,
+            delta=None
+        )
+
+    with metric_col2:
+        top_talent = len(df[df['Match Score'] > 75])
+        st.metric(
+            label="Top Talent",
+            value=top_talent,
+            delta=f"{(top_talent/total_candidates*100):.0f}%"
+        )
+
+    with metric_col3:
+        avg_score = df['Match Score'].mean()
+        st.metric(
+            label="Avg Shortlist Score",
+            value=f"{avg_score:.1f}%",
+            delta=None
+        )
+
+    with metric_col4:
+        best_match = df['Match Score'].max()
+        st.metric(
+            label="Best Match",
+            value=f"{best_match:.1f}%",
+            delta="Top Pick"
+        )
+
+    # Results Table
+    st.markdown("<br>", unsafe_allow_html=True)
+    st.markdown("""
+    <div class="section-header">
+        <span class="section-icon">🏆</span>
+        <h2 class="section-title">Ranked Shortlist</h2>
+    </div>
+    """, unsafe_allow_html=True)
+
+    # Style the dataframe
+    def highlight_score(val):
+        if isinstance(val, (int, float)):
+            if val > 75:
+                return 'background-color: #d1fae5; color: #065f46; font-weight: 600'
+            elif val > 50:
+                return 'background-color: #fef3c7; color: #92400e; font-weight: 600'
+            else:
+                return 'background-color: #f3f4f6; color: #4b5563'
+        return ''
+
+    # View operations over the stored rows
+    filter_col, sort_col, status_col = st.columns([2, 1, 1])
+    with filter_col:
+        query = st.text_input("Filter", placeholder="Name, email or skill...", key=f"{key}_filter")
+    with sort_col:
+        sort_by = st.selectbox("Sort by", ["Match Score", "Candidate Name", "Skills Count"], key=f"{key}_sort")
+    with status_col:
+        statuses = st.multiselect("Status", sorted(df['Status'].unique()), key=f"{key}_status")
+
+    view = df
+    if query:
+        searchable = view[['Candidate Name', 'Email', 'Top Skills Found']].astype(str)
+        view = view[searchable.apply(lambda col: col.str.contains(query, case=False, regex=False)).any(axis=1)]
+    if statuses:
+        view = view[view['Status'].isin(statuses)]
+    if sort_by != "Match Score":
+        # Rows are already ranked by score; other orders are stable re-sorts
+        view = view.sort_values(sort_by, ascending=sort_by == "Candidate Name", kind='stable')
+
+    pages = max(1, math.ceil(len(view) / page_size))
+    page = 1
+    if pages > 1:
+        page = st.number_input("Page", min_value=1, max_value=pages, value=1, key=f"{key}_page")
+    page_view = view.iloc[(page - 1) * page_size:page * page_size]
+
+    styled_df = page_view.style.applymap(highlight_score, subset=['Match Score'])
+    st.dataframe(styled_df, use_container_width=True, height=400)
+    st.caption(f"Showing {len(page_view)} of {len(view)} matching candidates ({len(df)} shortlisted)")
+
+    # Export Options
+    col_export1, col_export2 = st.columns(2)
+
+    with col_export1:
+        # Exports what is on screen: the filtered, sorted shortlist (all pages)
+        csv = view.to_csv(index=False).encode('utf-8')
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        st.download_button(
+            label="📥 Download Shortlist (CSV)",
+            data=csv,
+            file_name=f'candidate_shortlist_{timestamp}.csv',
+            mime='text/csv',
+            use_container_width=True
+        )
+
+    with col_export2:
+        top_candidates = df.head(5).to_csv(index=False).encode('utf-8')
+        st.download_button(
+            label="⭐ Download Top 5 Only (CSV)",
+            data=top_candidates,
+            file_name=f'top_5_candidates_{timestamp}.csv',
+            mime='text/csv',
+            use_container_width=True
+        )
+
+    # Top Pick Spotlights
+    st.markdown("<br>", unsafe_allow_html=True)
+    st.markdown("""
+    <div class="section-header">
+        <span class="section-icon">🌟</span>
+        <h2 class="section-title">Top Candidate Spotlights</h2>
+    </div>
+    """, unsafe_allow_html=True)
+
+    top_3 = df.head(3)
+    cols = st.columns(3)
+
+    for idx, (_, row) in enumerate(top_3.iterrows()):
+        with cols[idx]:
+            # Score circle
+            score = row['Match Score']
+            if score > 75:
+                score_class = 'score-high'
+            elif score > 50:
+                score_class = 'score-medium'
+            else:
+                score_class = 'score-low'
+
+            st.markdown(f"""
+            <div class="candidate-card">
+                <div class="score-circle {score_class}">
+                    {score:.0f}%
+                </div>
+                <h3 style="text-align: center; margin: 0 0 0.5rem 0;">
+                    {row['Candidate Name'][:30]}
+                </h3>
+                <div style="text-align: center; margin-bottom: 1rem;">
+                    <span class="{'top-talent-badge' if score > 75 else 'screening-badge'}">
+                        {row['Status']}
+                    </span>
+                </div>
+                <div class="contact-info">
+                    <span>📧</span>
+                    <span>{row['Email']}</span>
+                </div>
+                <div class="contact-info">
+                    <span>📱</span>
+                    <span>{row['Phone']}</span>
+                </div>
+                <div style="margin-top: 1rem;">
+                    <strong style="font-size: 0.875rem; color: #4b5563;">Key Skills:</strong>
+                    <div style="margin-top: 0.5rem;">
+                        {' '.join([f'<span class="skill-tag">{skill.strip()}</span>' for skill in row['Top Skills Found'].split(',')[:3]])}
+                    </div>
+                </div>
             </div>
-            """, unsafe_allow_html=True)
\ No newline at end of file
+            """, unsafe_allow_html=True)
@@ -0,0 +1,24 @@
+# views/resources.py
+import streamlit as st
+
+from core.engine import MatchingEngine
+from core.parse_cache import ParseCache
+from core.parser import ResumeParser
+
+# Built once per server process and shared by every session and rerun. None of
+# these hold per-request state, so concurrent script threads can use them safely.
+
+
+@st.cache_resource
+def get_engine():
+    return MatchingEngine()
+
+
+@st.cache_resource
+def get_parser():
+    return ResumeParser()
+
+
+@st.cache_resource
+def get_parse_cache():
+    return ParseCache()